@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Build the site as a dependency graph of targets.
+Each target lists the files it reads and writes. A target is skipped when
+the hashes of its inputs and outputs match the last successful run
+(recorded in .cache/build-state.json), targets whose dependencies are done
+run in parallel, and a summary with the critical path is printed at the end.
+
+Targets:
+    json      README.md → data/en.json, data/zh.json (GitHub Models API),
+              data/translation-source.json
+    validate  data/*.json against data/schema.json
+    images    data/*.json → images/share-*.png (og:image, needs Pillow)
+    html      data/*.json → index.html, index-en.html
+    search    data/*.json → search/
+
+Usage:
+    python scripts/build.py [TARGET ...] [--skip TARGET] [--force] [--jobs N] [--dry-run]
+"""
+
+import argparse
+import ast
+import hashlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from output_files import STATS_PATH_ENV, OutputStats, write_json
+from schema_validation import pointer, validate
+from share_images import FORMATS as SHARE_IMAGE_FORMATS, LOCALES, image_path
+
+STATE_PATH = Path('.cache/build-state.json')
+
+SCRIPTS = Path('scripts')
+DATA_FILES = ['data/en.json', 'data/zh.json']
+SHARE_IMAGE_FORMAT = 'png'
+SHARE_IMAGES = [image_path(lang, SHARE_IMAGE_FORMAT) for lang in LOCALES]
+# Pages link whichever format is on disk, including one rendered by hand
+# with share_images.py --format
+ALL_SHARE_IMAGES = [image_path(lang, fmt) for lang in LOCALES for fmt in SHARE_IMAGE_FORMATS]
+
+
+def script_inputs(script):
+    """
+    The script and every module under scripts/ it imports, directly or
+    through other modules, so editing any of them rebuilds the target
+    """
+    found = []
+    pending = [Path(script)]
+    while pending:
+        path = pending.pop()
+        if path in found or not path.exists():
+            continue
+        found.append(path)
+        for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            # Standard library and third-party modules have no file here
+            pending.extend(SCRIPTS / f"{name.split('.')[0]}.py" for name in names)
+    return sorted(found)
+
+
+def validate_data(out):
+    """Validate the data files against the schema, writing messages to out"""
+    with open('data/schema.json', 'r', encoding='utf-8') as f:
+        schema = json.load(f)
+    failed = False
+    for path in DATA_FILES:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                errors = validate(json.load(f), schema)
+        except (OSError, ValueError) as e:
+            errors = [((), str(e), None)]
+        for error_path, message, _ in errors[:10]:
+            print(f"Error: {path}{pointer(error_path)}: {message}", file=out)
+        if not errors:
+            print(f"✓ {path} is valid", file=out)
+        failed = failed or bool(errors)
+    return 1 if failed else 0
+
+
+class Target:
+    """A build step with its inputs, outputs and dependencies"""
+
+    def __init__(self, name, inputs, outputs, action, deps=(), allow_failure=False, description=''):
+        self.name = name
+        self.inputs = inputs
+        self.outputs = outputs
+        self.action = action
+        self.deps = tuple(deps)
+        # A failed target whose outputs still hold their last good version
+        # doesn't stop its dependents
+        self.allow_failure = allow_failure
+        self.description = description
+
+    def run(self):
+        """Run the action; returns (exit code, captured output, OutputStats)"""
+        stats = OutputStats()
+        if callable(self.action):
+            # Captured like a subprocess's output, so it is printed under the
+            # target's header rather than interleaved with other targets
+            output = io.StringIO()
+            return self.action(output), output.getvalue(), stats
+        with tempfile.TemporaryDirectory() as tmp:
+            stats_path = Path(tmp) / 'output-stats.jsonl'
+            result = subprocess.run([sys.executable, *self.action], capture_output=True, text=True,
+                                    env={**os.environ, STATS_PATH_ENV: str(stats_path)})
+            if stats_path.exists():
+                for line in stats_path.read_text(encoding='utf-8').splitlines():
+                    stats.add(json.loads(line))
+        return result.returncode, result.stdout + result.stderr, stats
+
+
+TARGETS = [
+    Target('json',
+           inputs=['README.md', 'data/schema.json', *script_inputs(SCRIPTS / 'generate-json.py')],
+           outputs=DATA_FILES + ['data/translation-source.json'],
+           action=[str(SCRIPTS / 'generate-json.py')],
+           allow_failure=True,
+           description='Generate data/*.json from README.md'),
+    Target('validate',
+           inputs=DATA_FILES + ['data/schema.json', *script_inputs(SCRIPTS / 'build.py')],
+           outputs=[],
+           action=validate_data,
+           deps=['json'],
+           description='Validate data/*.json against the schema'),
+    Target('images',
+           inputs=DATA_FILES + ['data/schema.json', *script_inputs(SCRIPTS / 'share_images.py')],
+           outputs=SHARE_IMAGES,
+           action=[str(SCRIPTS / 'share_images.py'), '--format', SHARE_IMAGE_FORMAT],
+           deps=['validate'],
+           # Without Pillow the pages are built without og:image
+           allow_failure=True,
+           description='Render the og:image / twitter:image share images'),
+    Target('html',
+           inputs=DATA_FILES + ALL_SHARE_IMAGES + ['data/schema.json',
+                                                   *script_inputs(SCRIPTS / 'generate-html.py')],
+           outputs=['index.html', 'index-en.html'],
+           action=[str(SCRIPTS / 'generate-html.py')],
+           deps=['validate', 'images'],
+           description='Render index.html and index-en.html'),
+    Target('search',
+           inputs=DATA_FILES + script_inputs(SCRIPTS / 'search_index.py'),
+           outputs=['search/zh.json', 'search/en.json', 'search/search.js'],
+           action=[str(SCRIPTS / 'search_index.py')],
+           deps=['validate'],
+           description='Build the client-side search index'),
+]
+
+
+def file_hash(path):
+    """sha256 of a file, or None if it doesn't exist"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def hash_files(paths):
+    return {str(path): file_hash(path) for path in paths}
+
+
+def load_state(path=STATE_PATH):
+    """Hashes recorded for each target at its last successful build"""
+    try:
+        return json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {'targets': {}}
+
+
+def select_targets(targets, goals, skip):
+    """Goals plus everything they depend on, minus skipped targets"""
+    by_name = {t.name: t for t in targets}
+    selected = set()
+    pending = list(goals or by_name)
+    while pending:
+        name = pending.pop()
+        if name not in by_name:
+            raise KeyError(name)
+        if name not in selected:
+            selected.add(name)
+            pending.extend(by_name[name].deps)
+    return [t for t in targets if t.name in selected and t.name not in skip]
+
+
+class Builder:
+    """Runs targets in dependency order, in parallel where possible"""
+
+    def __init__(self, targets, state_path=STATE_PATH, force=False, jobs=4, dry_run=False):
+        self.targets = {t.name: t for t in targets}
+        self.state_path = state_path
+        self.state = load_state(state_path) if not force else {'targets': {}}
+        self.jobs = jobs
+        self.dry_run = dry_run
+        # name -> {'status', 'start', 'end'} relative to the build start
+        self.results = {}
+        self.output_stats = {}
+        self.lock = threading.Lock()
+
+    def up_to_date(self, target):
+        recorded = self.state['targets'].get(target.name)
+        if not recorded:
+            return False
+        if recorded.get('inputs') != hash_files(target.inputs):
+            return False
+        outputs = hash_files(target.outputs)
+        return None not in outputs.values() and recorded.get('outputs') == outputs
+
+    def build(self, target):
+        """Build one target; returns its status"""
+        if self.dry_run:
+            upstream = any(self.results[d]['status'] == 'would build' for d in target.deps if d in self.results)
+            return 'would build' if upstream or not self.up_to_date(target) else 'up to date'
+        if self.up_to_date(target):
+            return 'up to date'
+
+        inputs = hash_files(target.inputs)
+        code, output, self.output_stats[target.name] = target.run()
+        with self.lock:
+            if output.strip():
+                print(f"── {target.name} " + '─' * max(0, 60 - len(target.name)))
+                print(output.rstrip())
+            if code != 0:
+                # Not recorded, so the target runs again next time
+                self.state['targets'].pop(target.name, None)
+                return 'failed'
+            self.state['targets'][target.name] = {'inputs': inputs, 'outputs': hash_files(target.outputs)}
+            write_json(self.state_path, self.state, stats=None)
+        return 'built'
+
+    def run(self):
+        start = time.perf_counter()
+        waiting = dict(self.targets)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            while waiting or running:
+                for name, target in list(waiting.items()):
+                    deps = [d for d in target.deps if d in self.targets]
+                    if any(d not in self.results for d in deps):
+                        continue
+                    del waiting[name]
+                    blocked = [d for d in deps if self.results[d]['status'] in ('failed', 'skipped')
+                               and not (self.results[d]['status'] == 'failed'
+                                        and self.targets[d].allow_failure)]
+                    if blocked:
+                        now = time.perf_counter() - start
+                        self.results[name] = {'status': 'skipped', 'start': now, 'end': now}
+                        continue
+                    running[pool.submit(self.build, target)] = (name, time.perf_counter() - start)
+                if not running:
+                    if waiting and not any(all(d in self.results for d in t.deps if d in self.targets)
+                                           for t in waiting.values()):
+                        raise RuntimeError(f"dependency cycle among {', '.join(waiting)}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, started = running.pop(future)
+                    try:
+                        status = future.result()
+                    except Exception as e:
+                        print(f"Error: {name}: {e}")
+                        status = 'failed'
+                    self.results[name] = {'status': status, 'start': started,
+                                          'end': time.perf_counter() - start}
+        return time.perf_counter() - start
+
+    def critical_path(self):
+        """The chain of dependencies that determined when the build finished"""
+        if not self.results:
+            return []
+        name = max(self.results, key=lambda n: self.results[n]['end'])
+        path = [name]
+        while True:
+            deps = [d for d in self.targets[name].deps if d in self.results]
+            if not deps:
+                return path[::-1]
+            name = max(deps, key=lambda d: self.results[d]['end'])
+            path.append(name)
+
+    def summarize(self, wall):
+        print(f"\n{'Target':<12}{'status':<14}{'time s':>8}{'written B':>12}{'skipped B':>12}")
+        total = OutputStats()
+        for name, result in sorted(self.results.items(), key=lambda item: item[1]['start']):
+            stats = self.output_stats.get(name, OutputStats())
+            total.add(stats)
+            print(f"{name:<12}{result['status']:<14}{result['end'] - result['start']:>8.2f}"
+                  f"{stats.written_bytes:>12}{stats.skipped_bytes:>12}")
+        path = self.critical_path()
+        path_time = sum(self.results[n]['end'] - self.results[n]['start'] for n in path)
+        print(f"\nCritical path: {' → '.join(path)} ({path_time:.2f} s of {wall:.2f} s wall)")
+        print(f"Outputs: {total.written_files} files written ({total.written_bytes} bytes), "
+              f"{total.skipped_files} unchanged ({total.skipped_bytes} bytes)")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Build the site from README.md and data/*.json')
+    parser.add_argument('targets', nargs='*', help='Targets to build with their dependencies (default: all)')
+    parser.add_argument('--skip', action='append', default=[], metavar='TARGET',
+                        help='Leave a target out, e.g. --skip json without a GITHUB_TOKEN')
+    parser.add_argument('--force', action='store_true', help='Rebuild every target')
+    parser.add_argument('--jobs', type=int, default=4, help='Targets run at once (default: 4)')
+    parser.add_argument('--dry-run', action='store_true', help='Show what would be built')
+    parser.add_argument('--list', action='store_true', help='List targets')
+    args = parser.parse_args()
+
+    if args.list:
+        for target in TARGETS:
+            deps = f" (after {', '.join(target.deps)})" if target.deps else ''
+            print(f"{target.name:<12}{target.description}{deps}")
+        return 0
+
+    try:
+        targets = select_targets(TARGETS, args.targets, set(args.skip))
+    except KeyError as e:
+        print(f"Error: unknown target {e}")
+        return 1
+
+    builder = Builder(targets, force=args.force, jobs=args.jobs, dry_run=args.dry_run)
+    wall = builder.run()
+    builder.summarize(wall)
+
+    failed = [n for n, r in builder.results.items() if r['status'] in ('failed', 'skipped')]
+    fatal = [n for n in failed if not builder.targets[n].allow_failure]
+    for name in failed:
+        if name not in fatal:
+            print(f"⚠ {name} failed; its outputs keep their last good version and it runs again next build")
+    if fatal:
+        print(f"Error: {', '.join(fatal)} did not complete")
+        return 1
+    print("✓ Build complete")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
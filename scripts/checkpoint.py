@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Per-locale checkpoints for generate-json.py.
+Each locale is written atomically as soon as it validates, and its status is
+recorded against a hash of the inputs (the requests sent to the model and
+the schema). A rerun with the same inputs only regenerates the locales that
+failed, and generate-html.py can tell which locales are still on their last
+good version.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+from output_files import write_json
+
+STATE_PATH = Path('.cache/generation-state.json')
+
+LOCALES = ('en', 'zh')
+
+
+def inputs_hash(*parts):
+    """Hash the generation inputs; any change invalidates all checkpoints"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def load_state(path=STATE_PATH):
+    """Load the checkpoint state, or an empty one"""
+    path = Path(path)
+    if not path.exists():
+        return {'inputs': None, 'locales': {}}
+    try:
+        return json.loads(path.read_text(encoding='utf-8'))
+    except ValueError:
+        return {'inputs': None, 'locales': {}}
+
+
+def save_state(state, path=STATE_PATH):
+    write_json(path, state, stats=None)
+
+
+class Checkpoint:
+    """Tracks which locales are done for the current inputs"""
+
+    def __init__(self, inputs, path=STATE_PATH, force=False):
+        self.path = path
+        self.state = load_state(path)
+        if force or self.state.get('inputs') != inputs:
+            self.state = {'inputs': inputs, 'locales': {}}
+
+    def pending(self, locales=LOCALES):
+        """Locales that still need to be generated"""
+        return [l for l in locales if self.state['locales'].get(l, {}).get('status') != 'done']
+
+    def commit(self, locale, data, output_path):
+        """Persist a validated locale and mark it done; returns True if the file changed"""
+        changed = write_json(output_path, data)
+        self._mark(locale, 'done')
+        return changed
+
+    def fail(self, locale, reason):
+        """Record that a locale failed; its file keeps the last good version"""
+        self._mark(locale, 'failed', reason=str(reason)[:500])
+
+    def _mark(self, locale, status, **extra):
+        self.state['locales'][locale] = {
+            'status': status,
+            'updated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            **extra,
+        }
+        save_state(self.state, self.path)
+
+
+def stale_locales(path=STATE_PATH):
+    """Locales whose last generation attempt failed, with the reason"""
+    state = load_state(path)
+    return {locale: info.get('reason', '')
+            for locale, info in state.get('locales', {}).items()
+            if info.get('status') != 'done'}
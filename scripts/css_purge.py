@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Remove CSS rules that can never match the rendered markup.
+The stylesheet in generate-html.py covers every section, breakpoint and hover
+state; this module collects the tags, classes and ids actually present in a
+page and drops the selectors that reference anything else.
+"""
+
+import re
+from html import unescape
+
+# Pseudo-classes that depend on user interaction or document structure.
+# They are ignored when matching, so rules using them are kept as long as the
+# rest of the selector matches something on the page.
+STATE_PSEUDO_CLASSES = {
+    'hover', 'focus', 'focus-visible', 'focus-within', 'active', 'visited',
+    'link', 'target', 'checked', 'disabled', 'enabled',
+    'root', 'not', 'first-child', 'last-child', 'only-child',
+    'first-of-type', 'last-of-type', 'only-of-type', 'nth-child',
+    'nth-of-type', 'nth-last-child', 'nth-last-of-type', 'empty',
+}
+
+# At-rules whose body is a list of style rules that can be purged
+NESTED_AT_RULES = ('@media', '@supports')
+
+STYLE_BLOCK = re.compile(r'(<style[^>]*>)(.*?)(</style>)', re.S)
+# Comments and the bodies of <script>/<style> are not markup; the opening
+# tag (group 1) is kept so the element itself still counts. Every pattern
+# starts with a literal so the scan stays fast on multi-megabyte pages
+NOT_MARKUP = re.compile(r'<(?:!--.*?-->|((?i:script|style)\b[^>]*>).*?</(?i:script|style)\s*>)', re.S)
+TAG_NAME = re.compile(r'<([a-zA-Z][-.:\w]*)')
+# Attribute names are matched in lower case, as the renderers write them
+CLASS_OR_ID = re.compile(r'''\s(class|id)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))''')
+PSEUDO = re.compile(r'::?([a-zA-Z-]+)(\((?:[^()]|\([^()]*\))*\))?')
+COMPOUND_PART = re.compile(r'([.#]?)(-?[_a-zA-Z][-_a-zA-Z0-9]*|\*)')
+COMBINATOR = re.compile(r'\s*[>+~]\s*|\s+')
+
+
+class UsageCollector:
+    """
+    Collect element names, classes and ids used in documents.
+    Tag names and class/id attributes are found with regular expressions
+    over the whole document instead of a full HTML parse, which was most of
+    the build time on large pages. Text that merely looks like an attribute
+    can only keep extra rules, never drop a used one. Each feed() must be
+    given whole tags.
+    """
+
+    def __init__(self):
+        self.tags = set()
+        self.classes = set()
+        self.ids = set()
+
+    def feed(self, document):
+        start = 0
+        for skipped in NOT_MARKUP.finditer(document):
+            self._scan(document, start, skipped.end(1) if skipped.group(1) else skipped.start())
+            start = skipped.end()
+        self._scan(document, start, len(document))
+
+    def _scan(self, document, start, end):
+        self.tags.update(tag.lower() for tag in set(TAG_NAME.findall(document, start, end)))
+        for name, *values in set(CLASS_OR_ID.findall(document, start, end)):
+            value = ''.join(values)
+            value = unescape(value) if '&' in value else value
+            if name == 'class':
+                self.classes.update(value.split())
+            elif value:
+                self.ids.add(value)
+
+    def close(self):
+        pass
+
+    @property
+    def usage(self):
+        return self.tags, self.classes, self.ids
+
+
+def collect_usage(*documents):
+    """Return (tags, classes, ids) used across the given HTML documents"""
+    collector = UsageCollector()
+    for document in documents:
+        collector.feed(document)
+    collector.close()
+    return collector.usage
+
+
+def split_selector_list(selector_text):
+    """Split a selector list on top-level commas"""
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(selector_text):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(selector_text[start:i].strip())
+            start = i + 1
+    parts.append(selector_text[start:].strip())
+    return [p for p in parts if p]
+
+
+def selector_can_match(selector, usage):
+    """Return True unless the selector references markup that is absent"""
+    tags, classes, ids = usage
+
+    unknown_pseudo = False
+
+    def strip_pseudo(match):
+        nonlocal unknown_pseudo
+        is_element = match.group(0).startswith('::')
+        name = match.group(1).lower()
+        if not is_element and name not in STATE_PSEUDO_CLASSES:
+            unknown_pseudo = True
+        return ''
+
+    bare = PSEUDO.sub(strip_pseudo, selector)
+    if unknown_pseudo:
+        # Can't reason about it statically, keep the rule
+        return True
+    bare = re.sub(r'\[[^\]]*\]', '', bare)
+
+    for compound in COMBINATOR.split(bare.strip()):
+        for prefix, name in COMPOUND_PART.findall(compound):
+            if name == '*':
+                continue
+            if prefix == '.' and name not in classes:
+                return False
+            if prefix == '#' and name not in ids:
+                return False
+            if not prefix and name.lower() not in tags:
+                return False
+    return True
+
+
+def _find_block_end(css, open_pos):
+    """Return the index just past the '}' matching the '{' at open_pos"""
+    depth = 0
+    i = open_pos
+    while i < len(css):
+        if css.startswith('/*', i):
+            i = css.find('*/', i + 2)
+            if i == -1:
+                return len(css)
+            i += 2
+            continue
+        char = css[i]
+        if char in '"\'':
+            end = css.find(char, i + 1)
+            i = len(css) if end == -1 else end + 1
+            continue
+        if char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(css)
+
+
+def _purge_rules(css, usage):
+    """Purge a list of rules, returning (css, kept_rule_count)"""
+    out = []
+    pending = ''
+    kept = 0
+    i = 0
+    while i < len(css):
+        # Whitespace and comments are held back until we know whether the
+        # next rule survives, so dropped rules don't leave blank gaps
+        if css[i].isspace():
+            j = i
+            while j < len(css) and css[j].isspace():
+                j += 1
+            pending += css[i:j]
+            i = j
+            continue
+        if css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            end = len(css) if end == -1 else end + 2
+            pending += css[i:end]
+            i = end
+            continue
+
+        brace = css.find('{', i)
+        semicolon = css.find(';', i)
+        if css[i] == '@' and semicolon != -1 and (brace == -1 or semicolon < brace):
+            # Statement at-rule such as @import or @charset
+            out.append(pending + css[i:semicolon + 1])
+            pending = ''
+            kept += 1
+            i = semicolon + 1
+            continue
+        if brace == -1:
+            pending += css[i:]
+            break
+
+        prelude = css[i:brace]
+        end = _find_block_end(css, brace)
+        block = css[i:end]
+
+        if prelude.startswith(NESTED_AT_RULES):
+            inner, inner_kept = _purge_rules(css[brace + 1:end - 1], usage)
+            keep = inner_kept > 0
+            if keep:
+                block = css[i:brace + 1] + inner + '}'
+        elif prelude.startswith('@'):
+            # @keyframes, @font-face and friends are kept verbatim
+            keep = True
+        else:
+            selectors = split_selector_list(prelude)
+            keep = any(selector_can_match(s, usage) for s in selectors)
+
+        if keep:
+            out.append(pending + block)
+            kept += 1
+            pending = ''
+        else:
+            pending = pending[:len(pending.rstrip())]
+        i = end
+
+    out.append(pending)
+    return ''.join(out), kept
+
+
+def purge_css(css, usage):
+    """Return the stylesheet without rules that cannot match"""
+    return _purge_rules(css, usage)[0]
+
+
+def purge_html_styles(html, extra_documents=(), collector=None):
+    """
+    Purge every <style> block in an HTML document.
+    extra_documents holds markup that is loaded into the page later (for
+    example fragments fetched on scroll) and must keep its styles.
+    collector is a UsageCollector that has already been fed markup written
+    to the page separately, such as streamed sections.
+    Returns (html, bytes_before, bytes_after) for the stylesheet content.
+    """
+    collector = collector or UsageCollector()
+    for document in (html, *extra_documents):
+        collector.feed(document)
+    collector.close()
+    usage = collector.usage
+    before = 0
+    after = 0
+
+    def replace(match):
+        nonlocal before, after
+        css = match.group(2)
+        purged = purge_css(css, usage)
+        before += len(css.encode('utf-8'))
+        after += len(purged.encode('utf-8'))
+        return match.group(1) + purged + match.group(3)
+
+    return STYLE_BLOCK.sub(replace, html), before, after
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Typed content model generated from data/schema.json.
+Every object in the schema becomes a class with __slots__ named after its
+properties (required ones first in the constructor, optional ones default
+to None), and a generated loader builds the whole tree from parsed JSON in
+a single walk. A missing required field fails at load time with the path
+to it instead of as a KeyError halfway through rendering. The schema
+allows fields it doesn't declare; those are kept as they were parsed and
+read like any other attribute, so loading never drops content.
+
+Usage:
+    python scripts/data_model.py source
+    python scripts/data_model.py bench [--projects 100000]
+"""
+
+import argparse
+import gc
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+from schema_validation import pointer, resolve_ref, validate
+
+SCHEMA_PATH = Path(__file__).resolve().parent.parent / 'data' / 'schema.json'
+
+ROOT_CLASS = 'SiteContent'
+
+# Slot holding fields that are in the data but not declared in the schema
+EXTRA_SLOT = '_extra'
+
+
+class ContentError(ValueError):
+    """Raised when a content file does not match the schema"""
+
+
+def camel_case(name):
+    return name[:1].upper() + name[1:]
+
+
+def singular(name):
+    if name.endswith('ies'):
+        return name[:-3] + 'y'
+    return name[:-1] if name.endswith('s') else name
+
+
+def generate_source(schema, root_name=ROOT_CLASS):
+    """
+    Return Python source defining one class and one loader per object schema,
+    and ITEM_LOADERS mapping each array of objects, by path, to the loader
+    for its items.
+    """
+    chunks = []
+    item_loaders = {}
+
+    def child_name(parent, key, is_array):
+        name = camel_case(singular(key) if is_array else key)
+        return name if parent == root_name and not is_array else parent + name
+
+    def value_expr(node, source, name, depth, path):
+        """Expression building the value of `node` from `source`"""
+        node = resolve_ref(node, schema)
+        if node.get('type') == 'object' and 'properties' in node:
+            return f'_load_{define(node, name, path)}({source})'
+        if node.get('type') == 'array' and 'items' in node:
+            var = f'_v{depth}'
+            item = value_expr(node['items'], var, name, depth + 1, path)
+            if item != var:
+                if item == f'_load_{name}({var})':
+                    item_loaders[path] = f'_load_{name}'
+                return f'[{item} for {var} in {source}]'
+        return source
+
+    def define(node, class_name, path=()):
+        properties = node['properties']
+        required = [key for key in properties if key in node.get('required', [])]
+        optional = [key for key in properties if key not in required]
+        params = ', '.join(required + [f'{key}=None' for key in optional])
+
+        args = []
+        for key in required + optional:
+            child = resolve_ref(properties[key], schema)
+            name = child_name(class_name, key, child.get('type') == 'array')
+            if key in required:
+                args.append(value_expr(child, f'd[{key!r}]', name, 0, path + (key,)))
+                continue
+            expr = value_expr(child, '_o', name, 0, path + (key,))
+            args.append(f'd.get({key!r})' if expr == '_o'
+                        else f'(None if (_o := d.get({key!r})) is None else {expr})')
+
+        # The subset test allocates nothing, so data without extra fields
+        # (the normal case) stays cheap to load
+        extra = (f'{EXTRA_SLOT}=None if d.keys() <= _KNOWN_{class_name} '
+                 f'else _extra(d, _KNOWN_{class_name})')
+        lines = [f'class {class_name}:',
+                 f'    __slots__ = {tuple(properties) + (EXTRA_SLOT,)!r}',
+                 '',
+                 f'    def __init__(self, {params}{", " if params else ""}{EXTRA_SLOT}=None):']
+        lines += [f'        self.{key} = {key}' for key in properties]
+        lines += [f'        self.{EXTRA_SLOT} = {EXTRA_SLOT}',
+                  '',
+                  '    __getattr__ = _extra_field',
+                  '',
+                  '    def __repr__(self):',
+                  '        return _repr(self)',
+                  '',
+                  '',
+                  f'_KNOWN_{class_name} = frozenset({list(properties)!r})',
+                  '',
+                  '',
+                  f'def _load_{class_name}(d):',
+                  f'    return {class_name}({", ".join(args + [extra])})',
+                  '']
+        chunks.append('\n'.join(lines))
+        return class_name
+
+    define(resolve_ref(schema, schema), root_name)
+    header = ('def _repr(obj):\n'
+              '    fields = ", ".join(f"{k}={getattr(obj, k)!r}" for k in obj.__slots__)\n'
+              '    return f"{type(obj).__name__}({fields})"\n'
+              '\n\n'
+              'def _extra(d, known):\n'
+              '    return {k: v for k, v in d.items() if k not in known}\n'
+              '\n\n'
+              'def _extra_field(obj, name):\n'
+              '    # Only called for names that are not slots\n'
+              f'    extra = object.__getattribute__(obj, {EXTRA_SLOT!r})\n'
+              '    if extra is not None and name in extra:\n'
+              '        return extra[name]\n'
+              '    raise AttributeError(f"{type(obj).__name__!r} object has no attribute {name!r}")\n')
+    loaders = ''.join(f'\n    {path!r}: {loader},' for path, loader in item_loaders.items())
+    return '\n\n'.join([header] + chunks + [f'ITEM_LOADERS = {{{loaders}\n}}\n'])
+
+
+def build_models(schema):
+    """Compile the generated classes; returns a namespace of classes and loaders"""
+    namespace = {'__name__': __name__}
+    exec(compile(generate_source(schema), '<data_model>', 'exec'), namespace)
+    return namespace
+
+
+def load_schema(path=SCHEMA_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+MODELS = build_models(load_schema())
+SiteContent = MODELS[ROOT_CLASS]
+ITEM_LOADERS = MODELS['ITEM_LOADERS']
+
+
+def from_data(data):
+    """Build the content model from already-parsed JSON"""
+    try:
+        return MODELS[f'_load_{ROOT_CLASS}'](data)
+    except (KeyError, TypeError, AttributeError):
+        # Only pay for a full validation when loading failed, to report where
+        errors = validate(data, load_schema())
+        if not errors:
+            raise
+        path, message, _ = errors[0]
+        raise ContentError(f"{pointer(path) or '/'}: {message}") from None
+
+
+def load_content(path):
+    """Load a content file (data/en.json, data/zh.json) into the model"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    try:
+        return from_data(data)
+    except ContentError as e:
+        raise ContentError(f"{path}: {e}") from None
+
+
+def synthetic_content(base_path, projects):
+    """Content with `projects` lead projects, cloned from a real data file"""
+    with open(base_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    templates = data['projects']['leadProjects'] + data['projects']['contributorProjects']
+    data['projects']['leadProjects'] = [
+        {**templates[i % len(templates)], 'name': f"{templates[i % len(templates)]['name']}-{i}"}
+        for i in range(projects)
+    ]
+    return data
+
+
+def measure(load, render, path, runs):
+    """Return (load_ms, render_ms, retained_bytes) as the best of `runs`"""
+    load_ms, render_ms = [], []
+    for _ in range(runs):
+        gc.collect()
+        start = time.perf_counter()
+        content = load(path)
+        loaded = time.perf_counter()
+        if render:
+            render(content)
+        load_ms.append((loaded - start) * 1000)
+        render_ms.append((time.perf_counter() - loaded) * 1000)
+        del content
+
+    gc.collect()
+    tracemalloc.start()
+    content = load(path)
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del content
+    return min(load_ms), min(render_ms) if render else None, retained
+
+
+def run_benchmark(projects, runs):
+    """
+    Compare plain dicts, dict-backed objects and the generated classes.
+    The renderers need attribute access, so dicts are only loaded; the
+    dict-backed SimpleNamespace row shows what rendering from them costs.
+    """
+    import importlib
+    generate_html = importlib.import_module('generate-html')
+
+    def load_dicts(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_namespaces(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f, object_hook=lambda d: SimpleNamespace(**d))
+
+    def render(content):
+        generate_html.render_page(content, 'en', purge_css=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'en.json'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(synthetic_content(SCHEMA_PATH.parent / 'en.json', projects), f, ensure_ascii=False)
+        print(f"Projects: {projects} ({path.stat().st_size / 1e6:.1f} MB JSON), best of {runs}")
+        print(f"\n{'Model':<12}{'load ms':>10}{'render ms':>12}{'total ms':>10}{'memory MB':>12}")
+        for name, load, render_with in (('dict', load_dicts, None),
+                                        ('namespace', load_namespaces, render),
+                                        ('slots', load_content, render)):
+            load_ms, render_ms, retained = measure(load, render_with, path, runs)
+            if render_ms is None:
+                print(f"{name:<12}{load_ms:>10.0f}{'-':>12}{'-':>10}{retained / 1e6:>12.1f}")
+                continue
+            print(f"{name:<12}{load_ms:>10.0f}{render_ms:>12.0f}{load_ms + render_ms:>10.0f}"
+                  f"{retained / 1e6:>12.1f}")
+    return 0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Content model generated from data/schema.json')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('source', help='Print the generated model source')
+    bench = subparsers.add_parser('bench', help='Compare memory and load+render time against dicts')
+    bench.add_argument('--projects', type=int, default=100000, help='Projects in the synthetic input')
+    bench.add_argument('--runs', type=int, default=3, help='Timed runs per model (default: 3)')
+    args = parser.parse_args()
+
+    if args.command == 'source':
+        print(generate_source(load_schema()))
+        return 0
+    return run_benchmark(args.projects, args.runs)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
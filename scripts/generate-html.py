@@ -6,10 +6,43 @@ with all content already in place, so search engines can index the content
 without needing to execute JavaScript.
 """
 
+import argparse
 import json
 import os
+import re
+import tempfile
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
 from html import escape
+from string import Formatter
+
+from checkpoint import stale_locales
+from css_purge import UsageCollector, purge_html_styles
+from data_model import ContentError, load_content
+from output_files import STATS as OUTPUT_STATS, AtomicTextOutput, write_text
+import lazy_sections
+import share_images
+from stream_content import stream_content
+
+# Per-site settings. Batch builds (generate-sites.py) override these from
+# each site's site.json; the defaults describe gmij.win.
+DEFAULT_SITE = {
+    'base_url': 'https://gmij.win',
+    'zh_path': '/',
+    'en_path': '/index-en.html',
+    'author': 'GMIJ',
+    'site_name': 'GMIJ Personal Page',
+    'job_title': 'Full Stack Engineer',
+    'description': '15 years .NET full stack development experience, 5 years technical management experience',
+    'knows_about': ['.NET Development', 'DevOps', 'Continuous Integration', 'Team Management',
+                    'Full Stack Development', 'AI Programming', 'AI Voice Interaction'],
+    'same_as': [
+        'https://github.com/gmij',
+        'https://github.com/dotnetcore/SmartSql',
+        'https://github.com/ant-design-blazor/ant-design-blazor',
+    ],
+}
 
 def load_json(filepath):
     """Load JSON data from file"""
@@ -22,8 +55,8 @@ def render_stats(stats):
     for stat in stats:
         html.append(f'''
             <div class="stat-item">
-                <span class="stat-number">{escape(stat["number"])}</span>
-                <span class="stat-label">{escape(stat["label"])}</span>
+                <span class="stat-number">{escape(stat.number)}</span>
+                <span class="stat-label">{escape(stat.label)}</span>
             </div>''')
     return ''.join(html)
 
@@ -33,8 +66,8 @@ def render_about_items(items):
     for item in items:
         html.append(f'''
             <div class="about-item">
-                <h3><span class="about-icon">{item["icon"]}</span>{escape(item["title"])}</h3>
-                <p>{escape(item["description"])}</p>
+                <h3><span class="about-icon">{item.icon}</span>{escape(item.title)}</h3>
+                <p>{escape(item.description)}</p>
             </div>''')
     return ''.join(html)
 
@@ -45,25 +78,30 @@ def render_project_card(project, github_label):
     </svg>'''
     
     links = []
-    if project.get('github'):
+    if project.github:
         links.append(f'''
-            <a href="{escape(project['github'])}" class="btn" target="_blank" rel="noopener noreferrer">
+            <a href="{escape(project.github)}" class="btn" target="_blank" rel="noopener noreferrer">
                 {github_icon_svg}
                 {escape(github_label)}
             </a>''')
     
-    if project.get('website'):
-        website_label = project.get('websiteLabel', 'Visit Site')
+    # Only lead projects declare website fields; a contributor project that
+    # has them anyway keeps them as extra fields of the model
+    website = getattr(project, 'website', None)
+    if website:
+        website_label = getattr(project, 'websiteLabel', None)
+        if website_label is None:
+            website_label = 'Visit Site'
         links.append(f'''
-            <a href="{escape(project['website'])}" class="btn btn-primary" target="_blank" rel="noopener noreferrer">
+            <a href="{escape(website)}" class="btn btn-primary" target="_blank" rel="noopener noreferrer">
                 {escape(website_label)}
             </a>''')
     
     return f'''
         <div class="project-card">
-            <h3>{escape(project["name"])}</h3>
-            <span class="project-badge">{escape(project["badge"])}</span>
-            <p>{escape(project["description"])}</p>
+            <h3>{escape(project.name)}</h3>
+            <span class="project-badge">{escape(project.badge)}</span>
+            <p>{escape(project.description)}</p>
             <div class="project-links">
                 {''.join(links)}
             </div>
@@ -77,10 +115,10 @@ def render_skills(categories):
     """Render skills section"""
     html = []
     for category in categories:
-        items_html = ''.join([f'<li>{escape(item)}</li>' for item in category['items']])
+        items_html = ''.join([f'<li>{escape(item)}</li>' for item in category.items])
         html.append(f'''
             <div class="skill-category">
-                <h3>{escape(category["name"])}</h3>
+                <h3>{escape(category.name)}</h3>
                 <ul class="skill-list">
                     {items_html}
                 </ul>
@@ -96,16 +134,61 @@ def render_footer_links(links, github_label):
     html = []
     for i, link in enumerate(links):
         prefix = ' · ' if i > 0 else ''
-        if link['label'] == github_label:
-            html.append(f'''{prefix}<a href="{escape(link['url'])}" target="_blank" rel="noopener noreferrer">
+        if link.label == github_label:
+            html.append(f'''{prefix}<a href="{escape(link.url)}" target="_blank" rel="noopener noreferrer">
                 {github_icon_svg}
-                {escape(link['label'])}
+                {escape(link.label)}
             </a>''')
         else:
-            html.append(f'''{prefix}<a href="{escape(link['url'])}" target="_blank" rel="noopener noreferrer">{escape(link['label'])}</a>''')
+            html.append(f'''{prefix}<a href="{escape(link.url)}" target="_blank" rel="noopener noreferrer">{escape(link.label)}</a>''')
     
     return ''.join(html)
 
+JSON_LD_ESCAPES = str.maketrans({'<': '\\u003c', '>': '\\u003e', '&': '\\u0026'})
+
+def render_json_ld(site):
+    """Render the JSON-LD Person object for the site"""
+    def value(v):
+        # Escaped so a value can't close the <script> element it sits in
+        return json.dumps(v, ensure_ascii=False).translate(JSON_LD_ESCAPES)
+    
+    same_as = ',\n'.join(f'        {value(url)}' for url in site['same_as'])
+    return f'''{{
+      "@context": "https://schema.org",
+      "@type": "Person",
+      "name": {value(site['author'])},
+      "url": {value(site['base_url'])},
+      "jobTitle": {value(site['job_title'])},
+      "description": {value(site['description'])},
+      "knowsAbout": [{', '.join(value(v) for v in site['knows_about'])}],
+      "sameAs": [
+{same_as}
+      ]
+    }}'''
+
+def compile_template(template):
+    """
+    Pre-parse a str.format template into literal and field pieces.
+    Rendering the compiled form is a single join, so the template text is
+    only scanned once per process instead of once per page.
+    """
+    pieces = []
+    for literal, field, _, _ in Formatter().parse(template):
+        if literal:
+            pieces.append((True, literal))
+        if field is not None:
+            pieces.append((False, field))
+    
+    def render(**values):
+        return ''.join(text if is_literal else str(values[text]) for is_literal, text in pieces)
+    
+    return render
+
+@lru_cache(maxsize=None)
+def get_compiled_template(lang_code):
+    """Get the compiled HTML template, parsed once per process"""
+    return compile_template(get_html_template(lang_code))
+
 def get_html_template(lang_code):
     """Get the base HTML template with styles"""
     return '''<!DOCTYPE html>
@@ -120,7 +203,7 @@ def get_html_template(lang_code):
     <meta name="title" content="{title}">
     <meta name="description" content="{description}">
     <meta name="keywords" content="{keywords}">
-    <meta name="author" content="GMIJ">
+    <meta name="author" content="{author}">
     <meta name="robots" content="index, follow">
     
     <!-- Open Graph / Facebook -->
@@ -128,38 +211,25 @@ def get_html_template(lang_code):
     <meta property="og:url" content="{canonical_url}">
     <meta property="og:title" content="{title}">
     <meta property="og:description" content="{description}">
-    <meta property="og:site_name" content="GMIJ Personal Page">
+    <meta property="og:site_name" content="{site_name}">{og_image_meta}
     
     <!-- Twitter -->
     <meta name="twitter:card" content="summary_large_image">
     <meta name="twitter:url" content="{canonical_url}">
     <meta name="twitter:title" content="{title}">
-    <meta name="twitter:description" content="{description}">
+    <meta name="twitter:description" content="{description}">{twitter_image_meta}
     
     <!-- Canonical URL -->
     <link rel="canonical" href="{canonical_url}">
     
     <!-- Alternate language versions -->
-    <link rel="alternate" hreflang="en" href="https://gmij.win/index-en.html">
-    <link rel="alternate" hreflang="zh-CN" href="https://gmij.win/">
-    <link rel="alternate" hreflang="x-default" href="https://gmij.win/">
+    <link rel="alternate" hreflang="en" href="{en_url}">
+    <link rel="alternate" hreflang="zh-CN" href="{zh_url}">
+    <link rel="alternate" hreflang="x-default" href="{zh_url}">
     
     <!-- JSON-LD Structured Data -->
     <script type="application/ld+json">
-    {{
-      "@context": "https://schema.org",
-      "@type": "Person",
-      "name": "GMIJ",
-      "url": "https://gmij.win",
-      "jobTitle": "Full Stack Engineer",
-      "description": "15 years .NET full stack development experience, 5 years technical management experience",
-      "knowsAbout": [".NET Development", "DevOps", "Continuous Integration", "Team Management", "Full Stack Development", "AI Programming", "AI Voice Interaction"],
-      "sameAs": [
-        "https://github.com/gmij",
-        "https://github.com/dotnetcore/SmartSql",
-        "https://github.com/ant-design-blazor/ant-design-blazor"
-      ]
-    }}
+    {json_ld}
     </script>
     
     <style>
@@ -302,6 +372,10 @@ def get_html_template(lang_code):
             border-bottom: 1px solid var(--border);
         }}
         
+        .lazy-section {{
+            content-visibility: auto;
+        }}
+        
         h2 {{
             font-size: 28px;
             font-weight: 600;
@@ -387,6 +461,11 @@ def get_html_template(lang_code):
             gap: 24px;
         }}
         
+        .projects-more {{
+            margin-top: 24px;
+            text-align: center;
+        }}
+        
         .project-card {{
             padding: 24px;
             background: var(--bg-primary);
@@ -611,7 +690,7 @@ def get_html_template(lang_code):
         </div>
     </header>
 
-    <section>
+    <section{about_attrs}>
         <div class="container">
             <h2>{about_title}</h2>
             <div class="about-grid">
@@ -620,23 +699,23 @@ def get_html_template(lang_code):
         </div>
     </section>
 
-    <section>
+    <section{projects_attrs}>
         <div class="container">
             <h2>{projects_title}</h2>
             
             <div class="section-subtitle">{projects_lead_title}</div>
             <div class="projects-grid">
                 {lead_projects_html}
-            </div>
+            </div>{lead_projects_more}
             
             <div class="section-subtitle">{projects_contributor_title}</div>
             <div class="projects-grid">
                 {contributor_projects_html}
-            </div>
+            </div>{contributor_projects_more}
         </div>
     </section>
 
-    <section>
+    <section{skills_attrs}>
         <div class="container">
             <h2>{skills_title}</h2>
             <div class="skills-grid">
@@ -645,86 +724,273 @@ def get_html_template(lang_code):
         </div>
     </section>
 
-    <footer>
+    <footer{footer_attrs}>
         <div class="container">
             <p>{footer_copyright}</p>
             <p>
                 {footer_links_html}
             </p>
         </div>
-    </footer>
+    </footer>{lazy_script}
 </body>
 </html>'''
 
-def generate_html_file(data, lang_code, output_path):
-    """Generate a complete HTML file from JSON data"""
+# Link text for the rest of a split project list (lazy mode)
+MORE_PROJECTS_LABELS = {'zh': '更多项目', 'en': 'More projects'}
+
+# Stand-ins used while streaming: the GitHub label in cards rendered before
+# ui is parsed, and the sections spooled to disk in the page skeleton
+GITHUB_LABEL_SLOT = '\x00githubLabel\x00'
+STREAMED_SECTIONS = ('about_html', 'lead_projects_html', 'contributor_projects_html', 'skills_html')
+SECTION_SLOT = re.compile('\x00(' + '|'.join(STREAMED_SECTIONS) + ')\x00')
+
+# html is the page; fragments maps relative paths to HTML loaded on scroll
+RenderedPage = namedtuple('RenderedPage', ['html', 'fragments', 'css_before', 'css_after'])
+
+def page_url(site, path):
+    """Join the site base URL and a page path"""
+    return site['base_url'].rstrip('/') + path
+
+def render_share_image_meta(site, share_image, alt):
+    """og:image and twitter:image tags for a share image path relative to the site root"""
+    if not share_image:
+        return {'og_image_meta': '', 'twitter_image_meta': ''}
+    url = page_url(site, '/' + share_image)
+    alt = escape(alt)
+    return {
+        'og_image_meta': (f'\n    <meta property="og:image" content="{url}">'
+                          f'\n    <meta property="og:image:width" content="{share_images.WIDTH}">'
+                          f'\n    <meta property="og:image:height" content="{share_images.HEIGHT}">'
+                          f'\n    <meta property="og:image:alt" content="{alt}">'),
+        'twitter_image_meta': (f'\n    <meta name="twitter:image" content="{url}">'
+                               f'\n    <meta name="twitter:image:alt" content="{alt}">'),
+    }
+
+def render_page(data, lang_code, site=None, purge_css=True, lazy=False, sections=None, share_image=None):
+    """
+    Render a complete HTML page from content loaded with load_content().
+    With lazy=True the sections below the header use content-visibility
+    with estimated intrinsic sizes, and long project lists are split into
+    fragments that load on scroll. sections holds already rendered HTML
+    for template fields such as about_html (see render_page_streaming).
+    share_image is the page's share image relative to the site root (see
+    share_images.py); without one no og:image tags are emitted.
+    """
+    site = {**DEFAULT_SITE, **(site or {})}
     
     # Determine URLs based on language
+    zh_url = page_url(site, site['zh_path'])
+    en_url = page_url(site, site['en_path'])
     if lang_code == 'en':
-        canonical_url = 'https://gmij.win/index-en.html'
-        lang_switch_url = '/'
-        lang_button_text = data['ui']['langButton']  # Should be Chinese text
+        canonical_url = en_url
+        lang_switch_url = site['zh_path']
+        lang_button_text = data.ui.langButton  # Should be Chinese text
     else:  # zh
-        canonical_url = 'https://gmij.win/'
-        lang_switch_url = '/index-en.html'
-        lang_button_text = data['ui']['langButton']  # Should be English text
+        canonical_url = zh_url
+        lang_switch_url = site['en_path']
+        lang_button_text = data.ui.langButton  # Should be English text
     
-    # Get the HTML template
-    template = get_html_template(lang_code)
+    # Get the compiled HTML template
+    template = get_compiled_template(lang_code)
     
     # Render all sections
-    stats_html = render_stats(data['header']['stats'])
-    about_html = render_about_items(data['about']['items'])
-    lead_projects_html = render_projects(data['projects']['leadProjects'], data['ui']['githubLabel'])
-    contributor_projects_html = render_projects(data['projects']['contributorProjects'], data['ui']['githubLabel'])
-    skills_html = render_skills(data['skills']['categories'])
-    footer_links_html = render_footer_links(data['footer']['links'], data['ui']['githubLabel'])
+    github_label = data.ui.githubLabel
+    lead_projects = data.projects.leadProjects
+    contributor_projects = data.projects.contributorProjects
+    
+    fragments = {}
+    lazy_html = dict.fromkeys(['about_attrs', 'projects_attrs', 'skills_attrs', 'footer_attrs',
+                               'lead_projects_more', 'contributor_projects_more', 'lazy_script'], '')
+    if lazy:
+        render_card = lambda project: render_project_card(project, github_label)
+        more_label = MORE_PROJECTS_LABELS.get(lang_code, MORE_PROJECTS_LABELS['en'])
+        lead_projects, lazy_html['lead_projects_more'], lead_fragments = lazy_sections.split_projects(
+            lead_projects, 'lead', lang_code, render_card, more_label)
+        contributor_projects, lazy_html['contributor_projects_more'], contributor_fragments = \
+            lazy_sections.split_projects(contributor_projects, 'contributor', lang_code, render_card, more_label)
+        fragments = {**lead_fragments, **contributor_fragments}
+        
+        lazy_html['about_attrs'] = lazy_sections.lazy_attrs(lazy_sections.about_height(data))
+        lazy_html['projects_attrs'] = lazy_sections.lazy_attrs(
+            lazy_sections.projects_height(data, lead_projects, contributor_projects))
+        lazy_html['skills_attrs'] = lazy_sections.lazy_attrs(lazy_sections.skills_height(data))
+        lazy_html['footer_attrs'] = lazy_sections.lazy_attrs(lazy_sections.footer_height(data))
+        if fragments:
+            lazy_html['lazy_script'] = lazy_sections.LAZY_SCRIPT
+    
+    section_html = {
+        'stats_html': render_stats(data.header.stats),
+        'about_html': render_about_items(data.about.items),
+        'lead_projects_html': render_projects(lead_projects, github_label),
+        'contributor_projects_html': render_projects(contributor_projects, github_label),
+        'skills_html': render_skills(data.skills.categories),
+        'footer_links_html': render_footer_links(data.footer.links, data.ui.githubLabel),
+    }
+    section_html.update(sections or {})
     
     # Fill in the template
     # Note: Meta tag content should NOT be HTML-escaped as they are in attribute values
     # Only escape content that goes into HTML body
-    html = template.format(
+    html = template(
         lang='zh-CN' if lang_code == 'zh' else 'en',
-        title=data['meta']['title'],
-        description=data['meta']['description'],
-        keywords=data['meta']['keywords'],
+        title=data.meta.title,
+        description=data.meta.description,
+        keywords=data.meta.keywords,
+        author=escape(site['author']),
+        site_name=escape(site['site_name']),
         canonical_url=canonical_url,
+        en_url=en_url,
+        zh_url=zh_url,
+        json_ld=render_json_ld(site),
         lang_switch_url=lang_switch_url,
         lang_button_text=escape(lang_button_text),
-        header_name=escape(data['header']['name']),
-        header_tagline=escape(data['header']['tagline']),
-        header_subtitle=escape(data['header']['subtitle']),
-        stats_html=stats_html,
-        about_title=escape(data['about']['title']),
-        about_html=about_html,
-        projects_title=escape(data['projects']['title']),
-        projects_lead_title=escape(data['projects']['leadTitle']),
-        projects_contributor_title=escape(data['projects']['contributorTitle']),
-        lead_projects_html=lead_projects_html,
-        contributor_projects_html=contributor_projects_html,
-        skills_title=escape(data['skills']['title']),
-        skills_html=skills_html,
-        footer_copyright=escape(data['footer']['copyright']),
-        footer_links_html=footer_links_html
+        header_name=escape(data.header.name),
+        header_tagline=escape(data.header.tagline),
+        header_subtitle=escape(data.header.subtitle),
+        about_title=escape(data.about.title),
+        projects_title=escape(data.projects.title),
+        projects_lead_title=escape(data.projects.leadTitle),
+        projects_contributor_title=escape(data.projects.contributorTitle),
+        skills_title=escape(data.skills.title),
+        footer_copyright=escape(data.footer.copyright),
+        **section_html,
+        **lazy_html,
+        **render_share_image_meta(site, share_image, f'{data.header.name} · {data.header.tagline}')
     )
     
+    # Drop style rules that can never match the rendered markup, keeping
+    # the ones needed by fragments loaded later
+    css_before = css_after = 0
+    if purge_css:
+        html, css_before, css_after = purge_html_styles(html, fragments.values())
+    
+    return RenderedPage(html, fragments, css_before, css_after)
+
+def write_page_streaming(path, lang_code, output_path, site=None, purge_css=True, share_image=None):
+    """
+    Render a page while its content file is parsed, without holding either
+    in memory. Cards are rendered as their entries are read and spooled to
+    temporary files; the page skeleton is rendered once the small fields
+    (including the GitHub label, which comes last in the file) are known,
+    and the spooled sections are copied into it. The result is identical
+    to render_page(load_content(path), ...).
+    Returns (css_bytes_before, css_bytes_after).
+    """
+    collector = UsageCollector()
+    spools = {name: tempfile.TemporaryFile('w+', encoding='utf-8') for name in STREAMED_SECTIONS}
+    renderers = {
+        ('about', 'items'): ('about_html', lambda item: render_about_items([item])),
+        ('projects', 'leadProjects'): ('lead_projects_html',
+                                       lambda item: render_project_card(item, GITHUB_LABEL_SLOT)),
+        ('projects', 'contributorProjects'): ('contributor_projects_html',
+                                              lambda item: render_project_card(item, GITHUB_LABEL_SLOT)),
+        ('skills', 'categories'): ('skills_html', lambda item: render_skills([item])),
+    }
+    
+    def on_item(array_path, item):
+        section, render = renderers[array_path]
+        html = render(item)
+        collector.feed(html)
+        spools[section].write(html)
+    
+    try:
+        data = stream_content(path, on_item)
+        skeleton = render_page(data, lang_code, site, purge_css=False,
+                               sections={name: f'\x00{name}\x00' for name in STREAMED_SECTIONS},
+                               share_image=share_image).html
+        css_before = css_after = 0
+        if purge_css:
+            skeleton, css_before, css_after = purge_html_styles(skeleton, collector=collector)
+        
+        github_label = escape(data.ui.githubLabel)
+        with AtomicTextOutput(output_path) as f:
+            parts = SECTION_SLOT.split(skeleton)
+            for i, part in enumerate(parts):
+                if i % 2 == 0:
+                    f.write(part)
+                    continue
+                spool = spools[part]
+                spool.seek(0)
+                # The label stand-in never spans lines
+                for line in spool:
+                    f.write(line.replace(GITHUB_LABEL_SLOT, github_label))
+    finally:
+        for spool in spools.values():
+            spool.close()
+    return css_before, css_after
+
+def generate_html_file(data, lang_code, output_path, purge_css=True, site=None, lazy=False, share_image=None):
+    """
+    Generate a complete HTML file from content loaded with load_content(),
+    or stream it from the content file when data is a Path
+    """
+    
+    if isinstance(data, Path):
+        css_before, css_after = write_page_streaming(data, lang_code, output_path, site, purge_css,
+                                                     share_image)
+        if purge_css:
+            print(f"✓ Purged CSS for {lang_code}: removed {css_before - css_after} bytes "
+                  f"({css_before} → {css_after})")
+        print(f"✓ Generated {output_path}")
+        return
+    
+    page = render_page(data, lang_code, site, purge_css, lazy, share_image=share_image)
+    if purge_css:
+        print(f"✓ Purged CSS for {lang_code}: removed {page.css_before - page.css_after} bytes "
+              f"({page.css_before} → {page.css_after})")
+    
     # Write to file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+    write_text(output_path, page.html)
     
     print(f"✓ Generated {output_path}")
+    
+    # Fragments are fetched relative to the page
+    for relative_path, fragment_html in page.fragments.items():
+        write_text(Path(output_path).parent / relative_path, fragment_html)
+    if page.fragments:
+        print(f"✓ Generated {len(page.fragments)} project fragments for {output_path}")
 
 def main():
     """Main function to generate all HTML files"""
     
+    parser = argparse.ArgumentParser(description='Generate index.html and index-en.html from data/*.json')
+    parser.add_argument('--lazy', action='store_true',
+                        help='Lazy-render below-the-fold sections and split long project lists')
+    parser.add_argument('--stream', action='store_true',
+                        help='Render while parsing the data files, for very large profiles')
+    parser.add_argument('--no-purge-css', dest='purge_css', action='store_false',
+                        help='Keep the whole stylesheet instead of dropping rules the page never uses')
+    args = parser.parse_args()
+    if args.stream and args.lazy:
+        parser.error('--stream cannot be combined with --lazy')
+    
+    # Locales whose last generation failed still have their previous,
+    # validated file on disk; render from that
+    for locale, reason in stale_locales().items():
+        print(f"⚠ {locale}.json generation is pending ({reason.splitlines()[0] if reason else 'not yet generated'}); "
+              f"rendering the last good version")
+    
     # Load JSON data
     data_dir = Path('data')
-    en_data = load_json(data_dir / 'en.json')
-    zh_data = load_json(data_dir / 'zh.json')
-    
-    # Generate HTML files
-    generate_html_file(zh_data, 'zh', Path('index.html'))
-    generate_html_file(en_data, 'en', Path('index-en.html'))
+    try:
+        if args.stream:
+            # Parsed while rendering, one locale at a time
+            en_data = data_dir / 'en.json'
+            zh_data = data_dir / 'zh.json'
+        else:
+            en_data = load_content(data_dir / 'en.json')
+            zh_data = load_content(data_dir / 'zh.json')
+        
+        # Generate HTML files
+        # Share images come from share_images.py; pages without one get no og:image
+        generate_html_file(zh_data, 'zh', Path('index.html'), args.purge_css, lazy=args.lazy,
+                           share_image=share_images.existing_image(Path('.'), 'zh'))
+        generate_html_file(en_data, 'en', Path('index-en.html'), args.purge_css, lazy=args.lazy,
+                           share_image=share_images.existing_image(Path('.'), 'en'))
+    except ContentError as e:
+        print(f"Error: {e}")
+        return 1
+    OUTPUT_STATS.report()
     
     print("\n✓ All HTML files generated successfully!")
     print("  - index.html (Chinese)")
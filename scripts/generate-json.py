@@ -4,12 +4,378 @@ Generate language-specific JSON files from README.md using AI
 This script uses GitHub Models API to understand README.md and generate structured JSON files
 """
 
+import argparse
+import contextlib
 import json
 import os
 import sys
+import time
 from pathlib import Path
 
-def generate_json_with_ai():
+from checkpoint import Checkpoint, inputs_hash
+from model_metrics import record_call
+from output_files import STATS as OUTPUT_STATS
+from prompt_builder import (build_prompt, build_repair_prompt, build_translation_prompt,
+                            default_name, estimate_tokens)
+from schema_validation import (drop_nulls, parse_pointer, pointer, set_path,
+                               to_strict_schema, validate)
+from translation_memory import ALIGNMENT_PATH, TranslationMemory, is_aligned, mark_aligned
+
+# Overridable so the script can run against scripts/standin_server.py
+API_URL = os.environ.get('MODELS_API_URL', 'https://models.github.ai/inference/chat/completions')
+
+MODEL = "openai/gpt-4o"
+SYSTEM_PROMPT = "You are a helpful assistant that converts personal information into structured JSON format. Always respond with valid JSON."
+
+# Structured-output mode: requests to fix invalid fields before giving up
+MAX_REPAIR_ROUNDS = 2
+
+# Transient failures (rate limiting, server errors) are retried with backoff
+MAX_ATTEMPTS = 3
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def backoff(metrics, attempt):
+    """Sleep before the next attempt and add the wait to metrics['backoff_ms']"""
+    delay = 2 ** attempt
+    time.sleep(delay)
+    metrics['backoff_ms'] += delay * 1000
+
+def call_models_api(api_url, headers, payload, extra_metrics=None):
+    """
+    POST a chat completion request and return the parsed response.
+    Token usage, time-to-first-byte, latency, retries and time spent backing
+    off are appended to the local metrics log whether or not the call
+    succeeds. Time-to-first-byte is for the last attempt only; latency covers
+    the whole call.
+    """
+    import requests
+    
+    metrics = {
+        'model': payload.get('model'),
+        'retries': 0,
+        'backoff_ms': 0,
+        'status': 'error',
+    }
+    metrics.update(extra_metrics or {})
+    start = time.perf_counter()
+    
+    try:
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            metrics['retries'] = attempt - 1
+            attempt_start = time.perf_counter()
+            try:
+                # stream=True returns as soon as the headers arrive, which
+                # gives us time-to-first-byte before the body is read
+                response = requests.post(api_url, headers=headers, json=payload, stream=True)
+                metrics['ttfb_ms'] = round((time.perf_counter() - attempt_start) * 1000, 1)
+                if response.status_code in RETRY_STATUS_CODES and attempt < MAX_ATTEMPTS:
+                    print(f"API returned {response.status_code}, retrying ({attempt}/{MAX_ATTEMPTS})...")
+                    # The body is never read, so release the connection
+                    response.close()
+                    backoff(metrics, attempt)
+                    continue
+                response.raise_for_status()
+                result = response.json()
+                break
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == MAX_ATTEMPTS:
+                    raise
+                print(f"Connection failed, retrying ({attempt}/{MAX_ATTEMPTS})...")
+                backoff(metrics, attempt)
+        
+        usage = result.get('usage') or {}
+        metrics['model'] = result.get('model') or metrics['model']
+        metrics['prompt_tokens'] = usage.get('prompt_tokens')
+        metrics['completion_tokens'] = usage.get('completion_tokens')
+        metrics['status'] = 'ok'
+        return result
+    finally:
+        metrics['latency_ms'] = round((time.perf_counter() - start) * 1000, 1)
+        record_call(metrics)
+        if metrics['status'] == 'ok':
+            print(f"✓ Model call: {metrics.get('prompt_tokens')} prompt + "
+                  f"{metrics.get('completion_tokens')} completion tokens, "
+                  f"{metrics['latency_ms']:.0f} ms ({metrics['retries']} retries)")
+
+def extract_json_from_markdown(text):
+    """Extract JSON from markdown code blocks"""
+    # Remove markdown code blocks
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    elif text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+def find_complete_json(text, start_pos=0, open_char='{', close_char='}'):
+    """Find a complete JSON object (or array) starting from start_pos"""
+    # Find the first opening bracket after start_pos
+    idx = text.find(open_char, start_pos)
+    if idx == -1:
+        return None
+    
+    # Count brackets to find the matching closing one
+    depth = 0
+    in_string = False
+    escape_next = False
+    
+    for i in range(idx, len(text)):
+        char = text[i]
+        
+        if escape_next:
+            escape_next = False
+            continue
+            
+        if char == '\\':
+            escape_next = True
+            continue
+            
+        if char == '"' and not escape_next:
+            in_string = not in_string
+            continue
+            
+        if not in_string:
+            if char == open_char:
+                depth += 1
+            elif char == close_char:
+                depth -= 1
+                if depth == 0:
+                    return text[idx:i+1]
+    
+    return None
+
+def parse_locale_sections(content, locales):
+    """
+    Extract one JSON string per locale from a response that labels them
+    "EN_JSON:", "ZH_JSON:" and so on. Returns {locale: json_str or None}.
+    """
+    labels = {locale: f"{locale.upper()}_JSON:" for locale in locales}
+    sections = {}
+    
+    # Try to find the labeled sections
+    for locale, label in labels.items():
+        if label not in content:
+            sections[locale] = None
+            continue
+        start = content.find(label) + len(label)
+        end = len(content)
+        for other in labels.values():
+            pos = content.find(other, start)
+            if other != label and pos != -1:
+                end = min(end, pos)
+        section = content[start:end].strip()
+        json_str = extract_json_from_markdown(section)
+        # Try to find complete JSON if extraction failed
+        if not json_str or not json_str.startswith('{'):
+            json_str = find_complete_json(section)
+        sections[locale] = json_str
+    
+    # If labels not found, take consecutive complete JSON objects in order
+    if not all(sections.values()):
+        pos = 0
+        for locale in locales:
+            json_str = find_complete_json(content, pos)
+            sections[locale] = json_str
+            if not json_str:
+                break
+            pos = content.find(json_str, pos) + len(json_str)
+    
+    return sections
+
+def validate_json(data, name, schema_obj):
+    """Validate JSON against the schema; returns an error message or None"""
+    errors = validate(data, schema_obj)
+    if errors:
+        details = ', '.join(f"{pointer(path)}: {message}" for path, message, _ in errors[:10])
+        print(f"Error: {name} does not match the schema: {details}")
+        return details
+    
+    print(f"✓ {name} has all required fields: {schema_obj.get('required', [])}")
+    return None
+
+def chat_payload(messages, response_format=None):
+    """Build a chat completion payload"""
+    payload = {
+        "messages": [{"role": "system", "content": SYSTEM_PROMPT}] + messages,
+        "model": MODEL,
+        "temperature": 0.3,
+        "max_tokens": 4000
+    }
+    if response_format:
+        payload["response_format"] = response_format
+    return payload
+
+def request_locales_labeled(api_url, headers, prompt, locales, metrics=None):
+    """
+    Request free text with "EN_JSON:"/"ZH_JSON:" labels and parse it.
+    Returns ({locale: data}, {locale: error}) so one bad locale doesn't
+    discard the others.
+    """
+    payload = chat_payload([{"role": "user", "content": prompt}])
+    result = call_models_api(api_url, headers, payload, metrics)
+    
+    # Extract the response
+    content = result['choices'][0]['message']['content']
+    
+    # Parse the response to extract JSON objects
+    sections = parse_locale_sections(content, locales)
+    parsed = {}
+    failures = {}
+    for locale in locales:
+        if not sections.get(locale):
+            failures[locale] = f"Could not parse AI response\nResponse: {content[:500]}"
+            continue
+        try:
+            parsed[locale] = json.loads(sections[locale])
+        except json.JSONDecodeError as e:
+            failures[locale] = f"Error parsing JSON: {e}\n{locale.upper()} JSON: {sections[locale][:200]}"
+    return parsed, failures
+
+def response_schema(schema_obj, locales):
+    """Wrap the content schema into a strict response schema keyed by locale"""
+    content_schema = to_strict_schema(schema_obj)
+    return {
+        "type": "object",
+        "properties": {locale: content_schema for locale in locales},
+        "required": list(locales),
+        "additionalProperties": False
+    }
+
+def json_schema_format(name, schema):
+    """response_format value for a strict JSON schema"""
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+def request_locales_structured(api_url, headers, prompt, schema_obj, locales, metrics=None):
+    """
+    Request the locales with data/schema.json as the response schema and
+    validate strictly. Invalid or missing fields are requested again on
+    their own instead of redoing the whole generation.
+    Returns ({locale: data}, {locale: error}).
+    """
+    full_schema = response_schema(schema_obj, locales)
+    messages = [{"role": "user", "content": prompt}]
+    payload = chat_payload(messages, json_schema_format('site_content', full_schema))
+    result = call_models_api(api_url, headers, payload, metrics)
+    content = result['choices'][0]['message']['content']
+    
+    try:
+        data = drop_nulls(json.loads(content))
+    except json.JSONDecodeError:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+    
+    validation_schema = {
+        "type": "object",
+        "properties": {locale: schema_obj for locale in locales},
+        "required": list(locales)
+    }
+    
+    for repair_round in range(MAX_REPAIR_ROUNDS + 1):
+        errors = validate(data, validation_schema)
+        if not errors or repair_round == MAX_REPAIR_ROUNDS:
+            break
+        
+        targets = {}
+        for path, message, subschema in errors:
+            print(f"  {pointer(path) or '/'}: {message}")
+            if subschema is None:
+                # Unexpected field: nothing to ask for, just drop it
+                parent = data
+                for part in path[:-1]:
+                    parent = parent[part]
+                del parent[path[-1]]
+            else:
+                targets[pointer(path)] = subschema
+        if not targets:
+            continue
+        
+        print(f"Requesting {len(targets)} missing or invalid field(s) again...")
+        repair_schema = {
+            "type": "object",
+            "properties": {ptr: to_strict_schema(sub) for ptr, sub in targets.items()},
+            "required": list(targets),
+            "additionalProperties": False
+        }
+        repair_messages = messages + [
+            {"role": "assistant", "content": content},
+            {"role": "user", "content": build_repair_prompt(list(targets))}
+        ]
+        payload = chat_payload(repair_messages, json_schema_format('site_content_repair', repair_schema))
+        result = call_models_api(api_url, headers, payload, {**(metrics or {}), 'purpose': 'repair'})
+        try:
+            fixes = drop_nulls(json.loads(result['choices'][0]['message']['content']))
+        except json.JSONDecodeError:
+            continue
+        for ptr, value in fixes.items():
+            if ptr in targets:
+                set_path(data, parse_pointer(ptr), value)
+    
+    failures = {}
+    for path, _, _ in errors:
+        failures.setdefault(path[0] if path else locales[0], []).append(pointer(path))
+    for locale in list(failures):
+        failures[locale] = (f"Still invalid after {MAX_REPAIR_ROUNDS} repair requests: "
+                            + ', '.join(failures[locale]))
+    parsed = {locale: data[locale] for locale in locales if locale in data and locale not in failures}
+    return parsed, failures
+
+def translate_strings(api_url, headers, strings):
+    """Translate a batch of Chinese strings in a single model call"""
+    prompt = build_translation_prompt(strings)
+    payload = chat_payload([{"role": "user", "content": prompt}])
+    
+    print(f"Calling GitHub Models API to translate {len(strings)} new strings...")
+    result = call_models_api(api_url, headers, payload, {
+        'purpose': 'translate',
+        'prompt_chars': len(prompt),
+    })
+    content = extract_json_from_markdown(result['choices'][0]['message']['content'])
+    array_str = content if content.startswith('[') else find_complete_json(content, 0, '[', ']')
+    if not array_str:
+        raise ValueError(f"Could not parse translation response: {content[:200]}")
+    translated = json.loads(array_str)
+    if not all(isinstance(t, str) for t in translated):
+        raise ValueError("Translation response is not an array of strings")
+    return translated
+
+def request_fingerprint(readme_content, schema, use_translation_memory, structured):
+    """
+    Hash of what a full run sends to the model: the generation payload
+    (prompt, MODEL, SYSTEM_PROMPT, sampling settings and response_format),
+    the translation prompt when it is used, and the schema the results are
+    validated against. Any change to these invalidates all checkpoints.
+    """
+    schema_obj = json.loads(schema)
+    locales = ('zh',) if use_translation_memory else ('en', 'zh')
+    prompt = build_prompt(readme_content, schema, default_name(), locales=locales, structured=structured)
+    response_format = (json_schema_format('site_content', response_schema(schema_obj, locales))
+                       if structured else None)
+    payloads = [chat_payload([{"role": "user", "content": prompt}], response_format)]
+    if use_translation_memory:
+        payloads.append(chat_payload([{"role": "user", "content": build_translation_prompt([])}]))
+    return inputs_hash(schema, *(json.dumps(p, ensure_ascii=False, sort_keys=True) for p in payloads))
+
+def seed_translation_memory(memory, data_dir):
+    """Record the committed zh.json/en.json pair as accepted translations"""
+    zh_path = data_dir / "zh.json"
+    en_path = data_dir / "en.json"
+    if not (zh_path.exists() and en_path.exists()):
+        return
+    zh_text = zh_path.read_text(encoding='utf-8')
+    if not is_aligned(zh_text):
+        # e.g. a run committed zh.json and then failed on en.json; pairing
+        # them by JSON path would store wrong translations
+        print(f"⚠ en.json was not translated from the committed zh.json ({ALIGNMENT_PATH} "
+              f"doesn't match); not seeding the translation memory")
+        return
+    with open(en_path, 'r', encoding='utf-8') as f:
+        en_data = json.load(f)
+    memory.seed(json.loads(zh_text), en_data)
+
+def generate_json_with_ai(use_translation_memory=True, structured=False, force=False):
     """Use GitHub Models API to generate JSON files from README.md"""
     
     # GitHub token is automatically available in Actions
@@ -34,212 +400,118 @@ def generate_json_with_ai():
     
     schema = schema_path.read_text(encoding='utf-8')
     
-    # Prepare the prompt for AI
-    prompt = f"""You are a helpful assistant that converts personal introduction content into structured JSON format.
-
-I have a README.md file with personal information in Chinese, and I need you to generate two JSON files following a specific schema:
-1. en.json - English version
-2. zh.json - Chinese version (based on the README content)
-
-README.md content:
-```
-{readme_content}
-```
-
-JSON Schema to follow:
-```json
-{schema}
-```
-
-Based on the README content, please generate BOTH en.json and zh.json files. 
-
-For the Chinese version (zh.json), extract and structure the information from README.md.
-For the English version (en.json), translate the content appropriately.
-
-Additional context:
-- Name: GMIJ
-- The person has 15 years of .NET development experience (2002-2017)
-- 5 years of management experience (2017-2023)
-- Expertise in DevOps, TeamCity, team building (0-to-1)
-- Managed R&D team (20+) and Operations team (70+)
-- Increased annual operations contract from 1M to nearly 20M CNY
-- Active in open source projects: SmartSql, Ant Design Blazor
-- Lead projects: DynamicWallpaper, Audio3A_CSharp, Green Software Download Site, Children Image, ZerotierFix
-- All recent projects are AI-powered/AI-written
-
-Please provide the output as two separate JSON objects labeled clearly as "EN_JSON:" and "ZH_JSON:".
-Ensure all required fields from the schema are included.
-Use proper English translations for the English version.
-"""
-
+    schema_obj = json.loads(schema)
+    data_dir = Path("data")
+    
+    # Each locale is checkpointed as soon as it validates; a rerun that
+    # would send the same requests only regenerates the pending locales
+    checkpoint = Checkpoint(request_fingerprint(readme_content, schema, use_translation_memory, structured),
+                            force=force)
+    pending = checkpoint.pending()
+    if not pending:
+        print("✓ en.json and zh.json are up to date for this README and prompt (use --force to regenerate)")
+        return 0
+    if len(pending) < 2:
+        print(f"Resuming: only {', '.join(pending)} still pending")
+    
+    # With the translation memory only zh.json is generated from the README;
+    # en.json is assembled from known translations plus one batched request
+    if use_translation_memory:
+        locales = tuple(l for l in ('zh',) if l in pending)
+    else:
+        locales = tuple(pending)
+    
+    stack = contextlib.ExitStack()
     try:
         import requests
         
         # Use GitHub Models API
-        api_url = "https://models.github.ai/inference/chat/completions"
+        api_url = API_URL
         
         headers = {
             "Content-Type": "application/json",
             "Authorization": f"Bearer {github_token}"
         }
         
-        payload = {
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant that converts personal information into structured JSON format. Always respond with valid JSON."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "model": "openai/gpt-4o",
-            "temperature": 0.3,
-            "max_tokens": 4000
-        }
-        
-        print("Calling GitHub Models API to generate JSON files...")
+        memory = None
+        if use_translation_memory and 'en' in pending:
+            memory = stack.enter_context(TranslationMemory())
+            # The committed files are the accepted translations. Once zh.json
+            # has been regenerated for these inputs they no longer line up.
+            if 'zh' in pending:
+                seed_translation_memory(memory, data_dir)
         
-        response = requests.post(api_url, headers=headers, json=payload)
-        response.raise_for_status()
-        
-        # Extract the response
-        result = response.json()
-        content = result['choices'][0]['message']['content']
-        
-        # Parse the response to extract JSON objects
-        en_json_str = None
-        zh_json_str = None
-        
-        def extract_json_from_markdown(text):
-            """Extract JSON from markdown code blocks"""
-            # Remove markdown code blocks
-            text = text.strip()
-            if text.startswith("```json"):
-                text = text[7:]
-            elif text.startswith("```"):
-                text = text[3:]
-            if text.endswith("```"):
-                text = text[:-3]
-            return text.strip()
-        
-        def find_complete_json(text, start_pos=0):
-            """Find a complete JSON object starting from start_pos"""
-            # Find the first '{' after start_pos
-            idx = text.find('{', start_pos)
-            if idx == -1:
-                return None
+        parsed = {}
+        failures = {}
+        if locales:
+            # Prepare the prompt for AI: drop README sections that never reach the
+            # page, minify the schema and derive the extra context from the README
+            name = default_name()
+            prompt = build_prompt(readme_content, schema, name, locales=locales, structured=structured)
+            raw_tokens = estimate_tokens(build_prompt(readme_content, schema, name, compact=False))
+            print(f"Prompt tokens (estimated): {raw_tokens} → {estimate_tokens(prompt)}")
             
-            # Count braces to find matching closing brace
-            brace_count = 0
-            in_string = False
-            escape_next = False
+            print("Calling GitHub Models API to generate JSON files...")
             
-            for i in range(idx, len(text)):
-                char = text[i]
-                
-                if escape_next:
-                    escape_next = False
-                    continue
-                    
-                if char == '\\':
-                    escape_next = True
-                    continue
-                    
-                if char == '"' and not escape_next:
-                    in_string = not in_string
-                    continue
-                    
-                if not in_string:
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            return text[idx:i+1]
-            
-            return None
-        
-        # Try to find EN_JSON and ZH_JSON markers
-        if "EN_JSON:" in content:
-            en_start = content.find("EN_JSON:") + len("EN_JSON:")
-            en_end = content.find("ZH_JSON:") if "ZH_JSON:" in content else len(content)
-            en_section = content[en_start:en_end].strip()
-            en_json_str = extract_json_from_markdown(en_section)
-            # Try to find complete JSON if extraction failed
-            if not en_json_str or not en_json_str.startswith('{'):
-                en_json_str = find_complete_json(en_section)
-        
-        if "ZH_JSON:" in content:
-            zh_start = content.find("ZH_JSON:") + len("ZH_JSON:")
-            zh_section = content[zh_start:].strip()
-            zh_json_str = extract_json_from_markdown(zh_section)
-            # Try to find complete JSON if extraction failed
-            if not zh_json_str or not zh_json_str.startswith('{'):
-                zh_json_str = find_complete_json(zh_section)
-        
-        # If markers not found, try to find two complete JSON objects
-        if not en_json_str or not zh_json_str:
-            en_json_str = find_complete_json(content, 0)
-            if en_json_str:
-                # Find the next JSON object after the first one
-                next_start = content.find(en_json_str) + len(en_json_str)
-                zh_json_str = find_complete_json(content, next_start)
-        
-        if not en_json_str or not zh_json_str:
-            print("Error: Could not parse AI response")
-            print("Response:", content[:500])
-            return 1
-        
-        # Parse JSON
-        try:
-            en_data = json.loads(en_json_str)
-            zh_data = json.loads(zh_json_str)
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON: {e}")
-            print("EN JSON:", en_json_str[:200])
-            print("ZH JSON:", zh_json_str[:200])
-            return 1
+            metrics = {
+                'purpose': 'generate',
+                'readme_bytes': len(readme_content.encode('utf-8')),
+                'prompt_chars': len(prompt),
+            }
+            if structured:
+                parsed, failures = request_locales_structured(api_url, headers, prompt, schema_obj,
+                                                              locales, metrics)
+            else:
+                parsed, failures = request_locales_labeled(api_url, headers, prompt, locales, metrics)
         
-        # Validate JSON against schema
-        schema_obj = json.loads(schema)
-        required_fields = schema_obj.get('required', [])
-        
-        def validate_json(data, name):
-            """Validate JSON has all required fields"""
-            missing_fields = []
-            for field in required_fields:
-                if field not in data:
-                    missing_fields.append(field)
-            
-            if missing_fields:
-                print(f"Error: {name} is missing required fields: {missing_fields}")
+        def commit_locale(locale, data):
+            """Validate a locale and persist it right away"""
+            error = validate_json(data, f"{locale}.json", schema_obj)
+            if error:
+                failures[locale] = error
+                checkpoint.fail(locale, error)
                 return False
-            
-            print(f"✓ {name} has all required fields: {required_fields}")
+            path = data_dir / f"{locale}.json"
+            if checkpoint.commit(locale, data, path):
+                print(f"✓ Generated {path}")
+            else:
+                print(f"✓ {path} is unchanged")
             return True
         
-        if not validate_json(en_data, "en.json"):
-            return 1
-        if not validate_json(zh_data, "zh.json"):
-            return 1
-        
-        # Write JSON files
-        data_dir = Path("data")
-        data_dir.mkdir(exist_ok=True)
+        committed = set()
+        for locale in locales:
+            if locale in parsed:
+                if commit_locale(locale, parsed[locale]):
+                    committed.add(locale)
+            else:
+                print(f"Error: {failures[locale]}")
+                checkpoint.fail(locale, failures[locale])
         
-        en_path = data_dir / "en.json"
-        zh_path = data_dir / "zh.json"
+        if use_translation_memory and 'en' in pending:
+            if 'zh' in failures:
+                # en.json is translated from zh.json, so it has to wait
+                checkpoint.fail('en', 'zh.json generation failed')
+                failures['en'] = 'zh.json generation failed'
+            else:
+                zh_text = (data_dir / "zh.json").read_text(encoding='utf-8')
+                en_data = memory.translate(
+                    json.loads(zh_text), lambda strings: translate_strings(api_url, headers, strings))
+                memory.report()
+                if commit_locale('en', en_data):
+                    committed.add('en')
         
-        with open(en_path, 'w', encoding='utf-8') as f:
-            json.dump(en_data, f, indent=2, ensure_ascii=False)
+        # Committed with en.json so the next run knows whether the pair
+        # lines up, whatever is left in the cache
+        if 'en' in committed:
+            if 'zh' in failures:
+                mark_aligned(None)
+            else:
+                mark_aligned((data_dir / "zh.json").read_text(encoding='utf-8'))
         
-        with open(zh_path, 'w', encoding='utf-8') as f:
-            json.dump(zh_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"✓ Generated {en_path}")
-        print(f"✓ Generated {zh_path}")
+        if failures:
+            print(f"Error: {', '.join(sorted(failures))} failed; the last good version is kept "
+                  f"and a rerun will only regenerate the failed locale(s)")
+            return 1
         
         return 0
         
@@ -259,10 +531,80 @@ Use proper English translations for the English version.
         import traceback
         traceback.print_exc()
         return 1
+    finally:
+        stack.close()
+
+def benchmark_request_modes(runs, failure_rate):
+    """
+    Compare the labeled and structured request modes against a stand-in
+    server that truncates a response or drops a field failure_rate of the
+    time, in either mode and in repair requests alike. A run fails when a
+    locale can't be parsed or, as in generate_json_with_ai(), doesn't match
+    the schema; a failed run is re-run in full, as CI would.
+    """
+    import io
+    import tempfile
+    import model_metrics
+    from standin_server import StandInModelServer
+    
+    readme_content = Path("README.md").read_text(encoding='utf-8')
+    schema = Path("data/schema.json").read_text(encoding='utf-8')
+    schema_obj = json.loads(schema)
+    locales = ('en', 'zh')
+    headers = {"Content-Type": "application/json"}
+    
+    print(f"{runs} runs per mode, failure rate {failure_rate:.0%}")
+    with tempfile.TemporaryDirectory() as tmp:
+        model_metrics.DEFAULT_LOG_PATH = Path(tmp) / 'bench.jsonl'
+        for mode in ('labeled', 'structured'):
+            structured = mode == 'structured'
+            prompt = build_prompt(readme_content, schema, default_name(), locales=locales, structured=structured)
+            failed_runs = 0
+            wall_times = []
+            with StandInModelServer(base_ms=20, ms_per_prompt_token=0.01, ms_per_completion_token=0.2,
+                                    failure_rate=failure_rate, seed=42) as server:
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    for attempt in range(5):
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            if structured:
+                                parsed, failures = request_locales_structured(server.url, headers, prompt,
+                                                                              schema_obj, locales)
+                            else:
+                                parsed, failures = request_locales_labeled(server.url, headers, prompt,
+                                                                           locales)
+                            invalid = [locale for locale, data in parsed.items() if validate(data, schema_obj)]
+                        if not failures and not invalid:
+                            break
+                        if attempt == 0:
+                            failed_runs += 1
+                    wall_times.append((time.perf_counter() - start) * 1000)
+                calls = server.requests
+            mean = sum(wall_times) / len(wall_times)
+            print(f"  {mode:<11} failed runs {failed_runs:>3}/{runs}  "
+                  f"mean wall {mean:7.1f} ms  model calls {calls}")
+    return 0
 
 def main():
     """Main function"""
-    return generate_json_with_ai()
+    parser = argparse.ArgumentParser(description='Generate data/en.json and data/zh.json from README.md')
+    parser.add_argument('--no-translation-memory', action='store_true',
+                        help='Generate both locales in one request instead of translating zh.json')
+    parser.add_argument('--structured', action='store_true',
+                        help='Request JSON-schema structured output and repair invalid fields')
+    parser.add_argument('--bench', type=int, metavar='RUNS',
+                        help='Compare request modes against a local stand-in server and exit')
+    parser.add_argument('--failure-rate', type=float, default=0.2,
+                        help='Stand-in failure rate for --bench (default: 0.2)')
+    parser.add_argument('--force', action='store_true',
+                        help='Ignore checkpoints and regenerate every locale')
+    args = parser.parse_args()
+    if args.bench:
+        return benchmark_request_modes(args.bench, args.failure_rate)
+    result = generate_json_with_ai(use_translation_memory=not args.no_translation_memory,
+                                   structured=args.structured, force=args.force)
+    OUTPUT_STATS.report()
+    return result
 
 if __name__ == "__main__":
     sys.exit(main())
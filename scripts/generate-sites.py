@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Render many personal or team sites in one process.
+Each site lives in its own directory under the sites directory:
+
+    sites/<name>/site.json   URLs and identity (see DEFAULT_SITE in generate-html.py),
+                             plus "lazy": true for lazy below-the-fold rendering
+    sites/<name>/zh.json     Chinese content, same schema as data/zh.json
+    sites/<name>/en.json     English content, same schema as data/en.json
+
+Pages are written to <output>/<name>/, with og:image tags for share images
+rendered there by share_images.py --sites. Sites are rendered in a worker pool;
+each worker compiles the HTML template once and reuses it for every site it
+renders.
+
+Usage:
+    python scripts/generate-sites.py [sites] [--output public] [--workers N]
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+generate_html = importlib.import_module('generate-html')
+from output_files import OutputStats, write_text
+from share_images import existing_image
+
+LOCALES = ('zh', 'en')
+
+
+def init_worker():
+    """Compile the templates once per worker process"""
+    for lang_code in LOCALES:
+        generate_html.get_compiled_template(lang_code)
+
+
+def output_filename(path):
+    """Map a page path such as '/' or '/index-en.html' to a file name"""
+    name = path.lstrip('/')
+    if not name or name.endswith('/'):
+        name += 'index.html'
+    return name
+
+
+def build_site(site_dir, output_dir):
+    """Render both locales of one site and return its timings in ms"""
+    start = time.perf_counter()
+    site = {**generate_html.DEFAULT_SITE, **generate_html.load_json(site_dir / 'site.json')}
+    data = {lang: generate_html.load_content(site_dir / f'{lang}.json') for lang in LOCALES}
+    loaded = time.perf_counter()
+
+    pages = {}
+    fragments = {}
+    css_removed = 0
+    for lang_code in LOCALES:
+        page = generate_html.render_page(data[lang_code], lang_code, site, lazy=site.get('lazy', False),
+                                         share_image=existing_image(output_dir, lang_code))
+        filename = output_filename(site[f'{lang_code}_path'])
+        pages[filename] = page.html
+        # Fragment URLs are relative to the page, so they go next to it
+        for relative_path, fragment_html in page.fragments.items():
+            fragments[Path(filename).parent / relative_path] = fragment_html
+        css_removed += page.css_before - page.css_after
+    rendered = time.perf_counter()
+
+    output_stats = OutputStats()
+    for filename, html in {**pages, **fragments}.items():
+        write_text(output_dir / filename, html, output_stats)
+    written = time.perf_counter()
+
+    return {
+        'load_ms': (loaded - start) * 1000,
+        'render_ms': (rendered - loaded) * 1000,
+        'write_ms': (written - rendered) * 1000,
+        'total_ms': (written - start) * 1000,
+        'pages': len(pages),
+        'fragments': len(fragments),
+        'css_removed': css_removed,
+        'output': output_stats.as_dict(),
+    }
+
+
+def find_sites(sites_dir):
+    """Return site directories that contain a site.json"""
+    return sorted(p.parent for p in sites_dir.glob('*/site.json'))
+
+
+def main():
+    """Main function to render every site definition"""
+    parser = argparse.ArgumentParser(description='Render many sites with a shared compiled template')
+    parser.add_argument('sites', nargs='?', type=Path, default=Path('sites'),
+                        help='Directory of site definitions (default: sites)')
+    parser.add_argument('--output', type=Path, default=Path('public'),
+                        help='Output directory (default: public)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    site_dirs = find_sites(args.sites)
+    if not site_dirs:
+        print(f"Error: no site definitions (*/site.json) found in {args.sites}")
+        return 1
+
+    start = time.perf_counter()
+    results = {}
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as pool:
+        futures = {
+            pool.submit(build_site, site_dir, args.output / site_dir.name): site_dir.name
+            for site_dir in site_dirs
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+                print(f"✓ Generated {args.output / name}")
+            except Exception as e:
+                failures += 1
+                print(f"Error: {name}: {e}")
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n{'Site':<30}{'load ms':>10}{'render ms':>12}{'write ms':>10}{'total ms':>10}{'CSS -B':>10}")
+    for name in sorted(results, key=lambda n: results[n]['total_ms'], reverse=True):
+        t = results[name]
+        print(f"{name:<30}{t['load_ms']:>10.1f}{t['render_ms']:>12.1f}"
+              f"{t['write_ms']:>10.1f}{t['total_ms']:>10.1f}{t['css_removed']:>10}")
+
+    output_stats = OutputStats()
+    for t in results.values():
+        output_stats.add(t['output'])
+    busy_ms = sum(t['total_ms'] for t in results.values())
+    print(f"\n✓ {len(results)} sites, {sum(t['pages'] for t in results.values())} pages "
+          f"({sum(t['fragments'] for t in results.values())} project fragments) "
+          f"in {wall_ms:.0f} ms wall ({busy_ms:.0f} ms of site work, {args.workers} workers)")
+    output_stats.report()
+    if failures:
+        print(f"Error: {failures} site(s) failed")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
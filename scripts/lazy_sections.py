@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Lazy below-the-fold rendering for generate-html.py.
+Sections below the header are marked with content-visibility: auto so the
+browser can skip their layout until they scroll into view. Each gets a
+contain-intrinsic-size hint estimated from the rendered content, so the
+scrollbar doesn't jump. Very long project lists keep their first chunk in
+the page for SEO and move the rest into HTML fragments fetched on scroll.
+"""
+
+import json
+import math
+import re
+from html import escape
+
+from prompt_builder import CJK
+
+# Projects rendered into the page itself; the rest go into fragments
+FIRST_CHUNK_PROJECTS = 24
+# Project cards per fetched fragment
+FRAGMENT_PROJECTS = 48
+
+# Layout constants mirroring the stylesheet in generate-html.py (desktop)
+CONTAINER_WIDTH = 952
+GRID_GAP = 24
+SECTION_PADDING = 64 * 2
+H2_HEIGHT = 28 * 1.7 + 32
+SUBTITLE_HEIGHT = 20 * 1.7 + 40 + 24
+PROJECT_COLUMNS = 3
+SKILL_COLUMNS = 3
+ABOUT_COLUMNS = 4
+
+TAG = re.compile(r'<[^>]+>')
+
+LAZY_SCRIPT = '''
+    <script>
+    (function () {
+        if (!('IntersectionObserver' in window) || !window.fetch) return;
+        var observer = new IntersectionObserver(function (entries) {
+            entries.forEach(function (entry) {
+                if (!entry.isIntersecting) return;
+                var more = entry.target;
+                var link = more.querySelector('a');
+                var urls = JSON.parse(more.getAttribute('data-fragments'));
+                observer.unobserve(more);
+                fetch(urls.shift()).then(function (r) { return r.text(); }).then(function (html) {
+                    more.previousElementSibling.insertAdjacentHTML('beforeend', html);
+                    if (urls.length) {
+                        more.setAttribute('data-fragments', JSON.stringify(urls));
+                        link.href = urls[0];
+                        observer.observe(more);
+                    } else {
+                        more.remove();
+                    }
+                });
+            });
+        }, { rootMargin: '800px 0px' });
+        document.querySelectorAll('.projects-more').forEach(function (more) {
+            observer.observe(more);
+        });
+    })();
+    </script>'''
+
+
+def text_height(text, font_px, width_px, line_height=1.7):
+    """Estimate the rendered height of a paragraph of text"""
+    text = TAG.sub('', text)
+    cjk = len(CJK.findall(text))
+    # CJK glyphs are about 1em wide, Latin text averages about 0.55em
+    width = (cjk + (len(text) - cjk) * 0.55) * font_px
+    lines = max(1, math.ceil(width / max(width_px, 1)))
+    return lines * font_px * line_height
+
+
+def grid_height(heights, columns, gap=GRID_GAP):
+    """Height of a grid whose rows are as tall as their tallest item"""
+    rows = [max(heights[i:i + columns]) for i in range(0, len(heights), columns)]
+    return sum(rows) + gap * max(len(rows) - 1, 0)
+
+
+def column_width(columns, gap=GRID_GAP):
+    return (CONTAINER_WIDTH - gap * (columns - 1)) / columns
+
+
+def project_card_height(project):
+    inner = column_width(PROJECT_COLUMNS) - 48
+    height = 48 + 18 * 1.7 + 8 + 12 * 1.7 + 8 + 12
+    height += text_height(project.description, 14, inner) + 16
+    if project.github or getattr(project, 'website', None):
+        height += 14 * 1.5 + 18
+    return height
+
+
+def about_height(data):
+    inner = column_width(ABOUT_COLUMNS) - 48
+    heights = [64 + 20 * 1.7 + 16 + text_height(item.description, 15, inner, 1.8)
+               for item in data.about.items]
+    return SECTION_PADDING + H2_HEIGHT + grid_height(heights or [0], ABOUT_COLUMNS)
+
+
+def projects_height(data, visible_lead, visible_contributor):
+    height = SECTION_PADDING + H2_HEIGHT + 2 * SUBTITLE_HEIGHT - 40
+    for projects in (visible_lead, visible_contributor):
+        height += grid_height([project_card_height(p) for p in projects] or [0], PROJECT_COLUMNS)
+    return height
+
+
+def skills_height(data):
+    heights = [18 * 1.7 + 16 + len(c.items) * (15 * 1.7 + 12)
+               for c in data.skills.categories]
+    return SECTION_PADDING + H2_HEIGHT + grid_height(heights or [0], SKILL_COLUMNS, 32)
+
+
+def footer_height(data):
+    return 48 * 2 + 2 * (14 * 1.7 + 12)
+
+
+def lazy_attrs(height):
+    """Attributes marking a section for lazy rendering"""
+    return f' class="lazy-section" style="contain-intrinsic-size: auto {math.ceil(height)}px"'
+
+
+def split_projects(projects, name, lang_code, render_card, more_label):
+    """
+    Split a project list into the prerendered first chunk and fragments.
+    Returns (visible_projects, more_html, {fragment_path: html}).
+    """
+    if len(projects) <= FIRST_CHUNK_PROJECTS:
+        return projects, '', {}
+
+    visible = projects[:FIRST_CHUNK_PROJECTS]
+    fragments = {}
+    for i, start in enumerate(range(FIRST_CHUNK_PROJECTS, len(projects), FRAGMENT_PROJECTS), 1):
+        chunk = projects[start:start + FRAGMENT_PROJECTS]
+        fragments[f'fragments/{lang_code}-{name}-{i}.html'] = ''.join(render_card(p) for p in chunk)
+
+    urls = list(fragments)
+    more_html = f'''
+            <div class="projects-more" data-fragments="{escape(json.dumps(urls))}">
+                <a href="{escape(urls[0])}" class="btn">{escape(more_label)}</a>
+            </div>'''
+    return visible, more_html, fragments
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Record and summarize metrics for GitHub Models API calls.
+Every call made by generate-json.py appends one line to a local JSONL log
+with token usage, time-to-first-byte, total latency, retries, time spent
+backing off and the model name, so the effect of README growth and prompt
+changes can be tracked.
+
+Usage:
+    python scripts/model_metrics.py summary [--last N] [--log PATH]
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Under .cache so the workflow's cache carries the log from run to run
+DEFAULT_LOG_PATH = Path(os.environ.get('MODEL_METRICS_LOG', '.cache/metrics/model-calls.jsonl'))
+
+# Numeric fields shown in the summary table
+SUMMARY_FIELDS = [
+    ('prompt_tokens', 'Prompt tokens'),
+    ('completion_tokens', 'Completion tokens'),
+    ('ttfb_ms', 'TTFB (ms)'),
+    ('latency_ms', 'Latency (ms)'),
+    ('retries', 'Retries'),
+    ('backoff_ms', 'Backoff (ms)'),
+]
+
+
+def record_call(entry, log_path=None):
+    """Append a single call record to the metrics log"""
+    log_path = log_path or DEFAULT_LOG_PATH
+    record = {'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+    record.update(entry)
+    log_path = Path(log_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+    return record
+
+
+def load_records(log_path=DEFAULT_LOG_PATH):
+    """Load all call records, skipping malformed lines"""
+    log_path = Path(log_path)
+    if not log_path.exists():
+        return []
+    records = []
+    with open(log_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile using linear interpolation"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * pct / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+def format_number(value):
+    """Format a metric value for the summary table"""
+    if value is None:
+        return '-'
+    if isinstance(value, float) and not value.is_integer():
+        return f"{value:.1f}"
+    return str(int(value))
+
+
+def summarize(records):
+    """Print percentiles and a trend for the given records"""
+    print(f"Calls: {len(records)}")
+    failed = sum(1 for r in records if r.get('status') != 'ok')
+    print(f"Failed: {failed}")
+
+    models = sorted({r.get('model') or '-' for r in records})
+    print(f"Models: {', '.join(models)}")
+    print()
+
+    print(f"{'Metric':<20}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for field, label in SUMMARY_FIELDS:
+        values = [r[field] for r in records if isinstance(r.get(field), (int, float))]
+        row = [percentile(values, 50), percentile(values, 90), percentile(values, 99),
+               max(values) if values else None]
+        print(f"{label:<20}" + ''.join(f"{format_number(v):>10}" for v in row))
+
+    # Trend: compare the newer half of the window with the older half
+    if len(records) >= 4:
+        half = len(records) // 2
+        older, newer = records[:half], records[half:]
+        print()
+        print("Trend (median, older half → newer half):")
+        for field, label in SUMMARY_FIELDS:
+            old_values = [r[field] for r in older if isinstance(r.get(field), (int, float))]
+            new_values = [r[field] for r in newer if isinstance(r.get(field), (int, float))]
+            old_median = percentile(old_values, 50)
+            new_median = percentile(new_values, 50)
+            if old_median is None or new_median is None:
+                continue
+            change = ''
+            if old_median:
+                change = f" ({(new_median - old_median) / old_median:+.0%})"
+            print(f"  {label:<18}{format_number(old_median)} → {format_number(new_median)}{change}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Summarize GitHub Models API call metrics')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    summary = subparsers.add_parser('summary', help='Show percentiles and trends')
+    summary.add_argument('--last', type=int, default=0, help='Only include the last N calls')
+    summary.add_argument('--log', type=Path, default=DEFAULT_LOG_PATH, help='Metrics log path')
+    args = parser.parse_args()
+
+    records = load_records(args.log)
+    if args.last:
+        records = records[-args.last:]
+    if not records:
+        print(f"No metrics recorded in {args.log}")
+        return 0
+
+    summarize(records)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
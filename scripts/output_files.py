@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Write build outputs only when their content changes.
+New content is compared with the existing file by size and sha256; an
+identical file is left alone, so its mtime, downstream caches and the
+workflow's git diff all see it as unchanged. Real writes go through a
+temporary file in the same directory and are renamed into place, so a
+reader never sees a half-written file.
+
+Every write is counted in an OutputStats. Scripts print the totals at the
+end; when OUTPUT_STATS_PATH is set (build.py sets it for each target) the
+totals are also appended there as a JSON line.
+"""
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+STATS_PATH_ENV = 'OUTPUT_STATS_PATH'
+
+# mkstemp creates files as 0600; a new output gets the usual mode for
+# published files instead, and a replaced one keeps the mode it had
+NEW_FILE_MODE = 0o644
+
+
+class OutputStats:
+    """Files and bytes written or skipped as unchanged"""
+
+    def __init__(self):
+        self.written_files = 0
+        self.written_bytes = 0
+        self.skipped_files = 0
+        self.skipped_bytes = 0
+
+    def add(self, other):
+        """Merge totals from another OutputStats or its as_dict()"""
+        other = other if isinstance(other, dict) else other.as_dict()
+        for key, value in other.items():
+            setattr(self, key, getattr(self, key) + value)
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    def report(self):
+        """Print the totals and record them for build.py"""
+        print(f"✓ Wrote {self.written_files} files ({self.written_bytes} bytes), "
+              f"skipped {self.skipped_files} unchanged ({self.skipped_bytes} bytes)")
+        stats_path = os.environ.get(STATS_PATH_ENV)
+        if stats_path:
+            with open(stats_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(self.as_dict()) + '\n')
+
+
+# Totals for this process
+STATS = OutputStats()
+
+
+def has_content(path, size, hexdigest):
+    """Whether the file at path has exactly this size and sha256"""
+    try:
+        if os.stat(path).st_size != size:
+            return False
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except (FileNotFoundError, IsADirectoryError):
+        return False
+    return digest.hexdigest() == hexdigest
+
+
+def count(stats, changed, size):
+    if stats is None:
+        return
+    if changed:
+        stats.written_files += 1
+        stats.written_bytes += size
+    else:
+        stats.skipped_files += 1
+        stats.skipped_bytes += size
+
+
+class AtomicOutput:
+    """
+    A binary file written to a temporary path. On close it replaces the
+    target if the content differs and is discarded otherwise.
+    """
+
+    def __init__(self, path, stats=STATS):
+        self.path = Path(path)
+        self.stats = stats
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self.tmp = tempfile.mkstemp(dir=self.path.parent, prefix=f'.{self.path.name}.', suffix='.tmp')
+        self.file = os.fdopen(fd, 'wb')
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.changed = None
+
+    def write(self, data):
+        self.file.write(data)
+        self.digest.update(data)
+        self.size += len(data)
+
+    def commit(self):
+        """Rename into place unless the target already has this content"""
+        self.file.close()
+        self.changed = not has_content(self.path, self.size, self.digest.hexdigest())
+        if self.changed:
+            try:
+                mode = stat.S_IMODE(os.stat(self.path).st_mode)
+            except FileNotFoundError:
+                mode = NEW_FILE_MODE
+            os.chmod(self.tmp, mode)
+            os.replace(self.tmp, self.path)
+        else:
+            os.unlink(self.tmp)
+        count(self.stats, self.changed, self.size)
+        return self.changed
+
+    def abort(self):
+        self.file.close()
+        os.unlink(self.tmp)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+
+
+class AtomicTextOutput(AtomicOutput):
+    """AtomicOutput that accepts str"""
+
+    def __init__(self, path, stats=STATS, encoding='utf-8'):
+        super().__init__(path, stats)
+        self.encoding = encoding
+
+    def write(self, text):
+        super().write(text.encode(self.encoding))
+
+
+def write_bytes(path, data, stats=STATS):
+    """Write bytes if they differ from the file's content; returns True if written"""
+    if has_content(path, len(data), hashlib.sha256(data).hexdigest()):
+        count(stats, False, len(data))
+        return False
+    with AtomicOutput(path, stats) as output:
+        output.write(data)
+    return True
+
+
+def write_text(path, text, stats=STATS, encoding='utf-8'):
+    return write_bytes(path, text.encode(encoding), stats)
+
+
+def write_json(path, data, stats=STATS):
+    """Write JSON in the format used for data/*.json"""
+    return write_text(path, json.dumps(data, indent=2, ensure_ascii=False), stats)
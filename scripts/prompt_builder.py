@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Build the prompt sent to GitHub Models by generate-json.py.
+The raw README contains sections that never reach the page (the bilingual
+build instructions) and the schema is pretty-printed with descriptive
+metadata, both of which inflate the request. This module strips and
+minifies them and derives the extra context from the README itself.
+
+Usage:
+    python scripts/prompt_builder.py            # show token counts
+    python scripts/prompt_builder.py --bench    # latency against a stand-in server
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+# README sections (level-2 headings) that are about the repository, not the person
+IGNORED_SECTIONS = [
+    re.compile(r'构建说明'),
+    re.compile(r'build instructions', re.I),
+]
+
+# Schema keys that only document the schema and don't constrain the output
+SCHEMA_METADATA_KEYS = {'$schema', 'title', 'description'}
+
+# Subschemas shorter than this (minified) are cheaper inline than as a $ref
+MIN_DEDUP_LENGTH = 48
+
+HEADING = re.compile(r'^(#{1,6})\s+(.*?)\s*$')
+MARKDOWN_LINK = re.compile(r'\[([^\]]+)\]\((https?://[^)\s]+)\)')
+GITHUB_REPO = re.compile(r'^https://github\.com/[^/]+/[^/]+/?$')
+HORIZONTAL_RULE = re.compile(r'^\s*(-{3,}|\*{3,}|_{3,})\s*$')
+CJK = re.compile(r'[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uff00-\uffef]')
+
+
+def strip_readme_sections(readme):
+    """Remove ignored sections, horizontal rules and repeated blank lines"""
+    kept = []
+    skip_level = None
+    in_fence = False
+    for line in readme.splitlines():
+        if line.lstrip().startswith('```'):
+            in_fence = not in_fence
+        heading = None if in_fence else HEADING.match(line)
+        if heading:
+            level = len(heading.group(1))
+            if skip_level is not None and level <= skip_level:
+                skip_level = None
+            if skip_level is None and any(p.search(heading.group(2)) for p in IGNORED_SECTIONS):
+                skip_level = level
+        if skip_level is not None or HORIZONTAL_RULE.match(line):
+            continue
+        kept.append(line.rstrip())
+
+    text = '\n'.join(kept)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return text.strip() + '\n'
+
+
+def _strip_schema_metadata(node, in_properties=False):
+    """Drop documentation-only keys; property names are left alone"""
+    if isinstance(node, dict):
+        result = {}
+        for key, value in node.items():
+            if not in_properties and key in SCHEMA_METADATA_KEYS:
+                continue
+            result[key] = _strip_schema_metadata(value, in_properties=(key == 'properties' and not in_properties))
+        return result
+    if isinstance(node, list):
+        return [_strip_schema_metadata(item) for item in node]
+    return node
+
+
+def _minified(node):
+    return json.dumps(node, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+
+
+def _dedupe_schema(schema):
+    """Move subschemas that occur more than once into definitions"""
+    counts = {}
+    names = {}
+
+    def count(node, name):
+        if isinstance(node, dict):
+            key = _minified(node)
+            if len(key) >= MIN_DEDUP_LENGTH:
+                counts[key] = counts.get(key, 0) + 1
+                names.setdefault(key, name)
+            for child_name, child in node.items():
+                count(child, child_name if child_name not in ('properties', 'items') else name)
+        elif isinstance(node, list):
+            for child in node:
+                count(child, name)
+
+    count(schema, 'root')
+    shared = {key for key, n in counts.items() if n > 1}
+    if not shared:
+        return schema
+
+    definitions = {}
+    used_names = set()
+    refs = {}
+    for key in sorted(shared, key=len, reverse=True):
+        name = names[key]
+        while name in used_names:
+            name += '_'
+        used_names.add(name)
+        refs[key] = name
+
+    def replace(node, top=False):
+        if isinstance(node, dict):
+            key = _minified(node)
+            if not top and key in refs:
+                name = refs[key]
+                if name not in definitions:
+                    definitions[name] = replace(node, top=True)
+                return {'$ref': f'#/definitions/{name}'}
+            return {k: replace(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [replace(item) for item in node]
+        return node
+
+    result = replace(schema, top=True)
+    result['definitions'] = definitions
+    return result
+
+
+def minify_schema(schema_text):
+    """Return the schema as compact JSON without documentation or duplicates"""
+    schema = json.loads(schema_text)
+    schema = _dedupe_schema(_strip_schema_metadata(schema))
+    return json.dumps(schema, ensure_ascii=False, separators=(',', ':'))
+
+
+def derive_context(readme, name=None):
+    """
+    Build the "Additional context" lines from the README.
+    Links are grouped under the paragraph that introduces them, so the model
+    gets the exact project names and URLs without a hand-maintained list.
+    """
+    lines = []
+    if name:
+        lines.append(f"- Name: {name}")
+
+    groups = []
+    current_intro = None
+    for line in strip_readme_sections(readme).splitlines():
+        links = MARKDOWN_LINK.findall(line)
+        if not links:
+            if line.strip():
+                current_intro = line.strip().rstrip(':：')
+            continue
+        repos = [(text, url) for text, url in links if GITHUB_REPO.match(url)]
+        sites = [url for text, url in links if not GITHUB_REPO.match(url)]
+        if not repos:
+            continue
+        if not groups or groups[-1][0] != current_intro:
+            groups.append((current_intro, []))
+        for text, url in repos:
+            entry = f"{text} ({url}"
+            if len(repos) == 1 and sites:
+                entry += f", site: {sites[0]}"
+            groups[-1][1].append(entry + ")")
+
+    for intro, entries in groups:
+        label = intro or "Projects"
+        lines.append(f"- {label}: {'; '.join(entries)}")
+    return '\n'.join(lines)
+
+
+def estimate_tokens(text):
+    """
+    Count tokens with tiktoken when it is installed, otherwise estimate:
+    CJK characters are roughly one token each, other text about four
+    characters per token.
+    """
+    try:
+        import tiktoken
+        return len(tiktoken.get_encoding('o200k_base').encode(text))
+    except Exception:
+        cjk = len(CJK.findall(text))
+        return cjk + (len(text) - cjk + 3) // 4
+
+
+LOCALE_DESCRIPTIONS = {
+    'en': 'en.json (English translation)',
+    'zh': 'zh.json (Chinese, taken from the README)',
+}
+
+
+def build_prompt(readme_content, schema_text, name=None, compact=True, locales=('en', 'zh'),
+                 structured=False):
+    """
+    Build the user prompt for generating the requested locale files.
+    With structured=True the schema travels in response_format, so it is
+    left out of the prompt and the output is keyed by locale.
+    """
+    if compact:
+        readme_content = strip_readme_sections(readme_content)
+        schema_text = minify_schema(schema_text)
+    context = derive_context(readme_content, name)
+
+    documents = ' and '.join(LOCALE_DESCRIPTIONS[locale] for locale in locales)
+    labels = ' and '.join(f'"{locale.upper()}_JSON:"' for locale in locales)
+    noun = 'JSON document' if len(locales) == 1 else f'{len(locales)} JSON documents'
+    objects = 'JSON object' if len(locales) == 1 else f'{len(locales)} JSON objects'
+    english = ' Use natural English in en.json.' if 'en' in locales else ''
+
+    if structured:
+        keys = ' and '.join(f'"{locale}"' for locale in locales)
+        return f"""Convert the personal introduction below (Chinese README) into {noun} following the response schema: {documents}.
+
+README:
+```
+{readme_content}
+```
+
+Additional context:
+{context}
+
+Respond with one JSON object whose keys {keys} hold the documents.{english}
+"""
+
+    return f"""Convert the personal introduction below (Chinese README) into {noun} that follow the JSON Schema: {documents}.
+
+README:
+```
+{readme_content}
+```
+
+JSON Schema:
+```json
+{schema_text}
+```
+
+Additional context:
+{context}
+
+Output the {objects} labeled {labels}. Include every required field.{english}
+"""
+
+
+def build_repair_prompt(pointers):
+    """Ask again for the fields that failed validation, by JSON pointer"""
+    listed = '\n'.join(f"- {p}" for p in pointers)
+    return f"""Some fields in your JSON were missing or invalid. Return a JSON object whose keys are exactly these JSON pointers and whose values are the corrected values:
+{listed}
+"""
+
+
+def build_translation_prompt(strings):
+    """Build the prompt for translating a batch of Chinese strings"""
+    source = json.dumps(strings, ensure_ascii=False)
+    return f"""Translate each Chinese string in the JSON array below into natural English for a personal website. Keep product names, numbers and emoji. Return only a JSON array of {len(strings)} strings in the same order.
+
+{source}
+"""
+
+
+def default_name(data_dir=Path('data')):
+    """Reuse the name from the last generated data, if any"""
+    for filename in ('zh.json', 'en.json'):
+        path = data_dir / filename
+        if path.exists():
+            try:
+                return json.loads(path.read_text(encoding='utf-8'))['header']['name']
+            except (ValueError, KeyError, TypeError):
+                continue
+    return None
+
+
+def run_benchmark(prompts, runs):
+    """Post each prompt to a local stand-in server and report latency"""
+    import urllib.request
+    from standin_server import StandInModelServer
+
+    with StandInModelServer() as server:
+        print(f"Stand-in server: {server.url} "
+              f"({server.ms_per_prompt_token} ms/prompt token, "
+              f"{server.ms_per_completion_token} ms/completion token)")
+        for label, prompt in prompts:
+            payload = json.dumps({
+                'model': 'openai/gpt-4o',
+                'messages': [{'role': 'user', 'content': prompt}],
+            }).encode('utf-8')
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                request = urllib.request.Request(server.url, data=payload,
+                                                 headers={'Content-Type': 'application/json'})
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            mean = sum(timings) / len(timings)
+            print(f"  {label:<8} {len(payload):>7} bytes  "
+                  f"mean {mean:7.1f} ms  p50 {timings[len(timings) // 2]:7.1f} ms")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Show prompt size before and after compaction')
+    parser.add_argument('--bench', action='store_true', help='Measure latency against a local stand-in server')
+    parser.add_argument('--runs', type=int, default=5, help='Requests per prompt variant')
+    args = parser.parse_args()
+
+    readme = Path('README.md').read_text(encoding='utf-8')
+    schema = Path('data/schema.json').read_text(encoding='utf-8')
+    name = default_name()
+
+    raw = build_prompt(readme, schema, name, compact=False)
+    compact = build_prompt(readme, schema, name)
+    raw_tokens = estimate_tokens(raw)
+    compact_tokens = estimate_tokens(compact)
+    print(f"Prompt tokens: {raw_tokens} → {compact_tokens} "
+          f"({(raw_tokens - compact_tokens) / raw_tokens:.0%} smaller)")
+    print(f"Prompt bytes:  {len(raw.encode('utf-8'))} → {len(compact.encode('utf-8'))}")
+
+    if args.bench:
+        run_benchmark([('raw', raw), ('compact', compact)], args.runs)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
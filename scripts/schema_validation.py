@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Minimal JSON Schema support for the generation pipeline.
+Covers the subset used by data/schema.json (type, required, properties,
+items, additionalProperties, $ref) without adding a jsonschema dependency,
+and converts the schema into the strict form required by the
+response_format json_schema request mode.
+"""
+
+import copy
+
+TYPE_CHECKS = {
+    'object': lambda v: isinstance(v, dict),
+    'array': lambda v: isinstance(v, list),
+    'string': lambda v: isinstance(v, str),
+    'number': lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    'integer': lambda v: isinstance(v, int) and not isinstance(v, bool),
+    'boolean': lambda v: isinstance(v, bool),
+    'null': lambda v: v is None,
+}
+
+# Keys the strict response_format mode rejects or doesn't need
+UNSUPPORTED_STRICT_KEYS = {'$schema', 'title', 'description'}
+
+
+def pointer(path):
+    """Format a path tuple as a JSON pointer"""
+    return ''.join('/' + str(part).replace('~', '~0').replace('/', '~1') for part in path)
+
+
+def parse_pointer(text):
+    """Parse a JSON pointer into a path tuple (array indexes become ints)"""
+    if not text:
+        return ()
+    parts = []
+    for part in text.lstrip('/').split('/'):
+        part = part.replace('~1', '/').replace('~0', '~')
+        parts.append(int(part) if part.isdigit() else part)
+    return tuple(parts)
+
+
+def resolve_ref(schema, root):
+    """Follow a local $ref"""
+    while isinstance(schema, dict) and '$ref' in schema:
+        node = root
+        for part in parse_pointer(schema['$ref'].lstrip('#')):
+            node = node[part]
+        schema = node
+    return schema
+
+
+def validate(data, schema, root=None, path=()):
+    """
+    Validate data against schema.
+    Returns a list of (path, message, subschema) errors; subschema is the
+    schema the value at path must satisfy, so callers can request just
+    that part again.
+    """
+    root = schema if root is None else root
+    schema = resolve_ref(schema, root)
+    errors = []
+
+    expected = schema.get('type')
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(TYPE_CHECKS[t](data) for t in types):
+            errors.append((path, f"expected {' or '.join(types)}", schema))
+            return errors
+
+    if isinstance(data, dict):
+        properties = schema.get('properties', {})
+        for key in schema.get('required', []):
+            if key not in data:
+                errors.append((path + (key,), 'missing required field',
+                               resolve_ref(properties.get(key, {}), root)))
+        for key, value in data.items():
+            if key in properties:
+                errors.extend(validate(value, properties[key], root, path + (key,)))
+            elif schema.get('additionalProperties') is False:
+                errors.append((path + (key,), 'unexpected field', None))
+
+    if isinstance(data, list) and 'items' in schema:
+        for index, item in enumerate(data):
+            errors.extend(validate(item, schema['items'], root, path + (index,)))
+
+    return errors
+
+
+def to_strict_schema(schema):
+    """
+    Convert a schema to the strict structured-output form: every object lists
+    all its properties as required, optional ones become nullable, and
+    additionalProperties is false. Use drop_nulls() on the response.
+    """
+    schema = copy.deepcopy(schema)
+
+    def convert(node):
+        if isinstance(node, list):
+            return [convert(item) for item in node]
+        if not isinstance(node, dict):
+            return node
+        node = {k: v for k, v in node.items() if k not in UNSUPPORTED_STRICT_KEYS}
+        if 'properties' in node:
+            required = set(node.get('required', []))
+            properties = {}
+            for key, value in node['properties'].items():
+                value = convert(value)
+                if key not in required and isinstance(value.get('type'), str):
+                    value['type'] = [value['type'], 'null']
+                properties[key] = value
+            node['properties'] = properties
+            node['required'] = list(properties)
+            node['additionalProperties'] = False
+        for key in ('items', 'definitions', '$defs'):
+            if key in node:
+                node[key] = ({k: convert(v) for k, v in node[key].items()}
+                             if key != 'items' else convert(node[key]))
+        return node
+
+    return convert(schema)
+
+
+def drop_nulls(data):
+    """Remove null-valued optional fields produced by strict mode"""
+    if isinstance(data, dict):
+        return {k: drop_nulls(v) for k, v in data.items() if v is not None}
+    if isinstance(data, list):
+        return [drop_nulls(item) for item in data]
+    return data
+
+
+def get_path(data, path):
+    """Return the value at path, or None"""
+    for part in path:
+        try:
+            data = data[part]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return data
+
+
+def set_path(data, path, value):
+    """Set the value at path, creating intermediate objects"""
+    for part in path[:-1]:
+        if isinstance(data, list):
+            data = data[part]
+        else:
+            data = data.setdefault(part, {})
+    data[path[-1]] = value
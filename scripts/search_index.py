@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Build a client-side search index over projects and skills.
+For each locale the lead projects, contributor projects and skills are
+tokenized (Latin words, plus overlapping bigrams for CJK text so Chinese
+can be searched without a word segmenter) and written as a compact index:
+a sorted term list for prefix lookup by binary search, and delta-encoded
+posting lists. A small loader, search/search.js, answers queries in the
+browser with the same tokenizer.
+
+Usage:
+    python scripts/search_index.py [--output search]
+    python scripts/search_index.py --query TEXT [--lang zh]
+    python scripts/search_index.py --bench [--items 10000] [--queries 2000]
+"""
+
+import argparse
+import bisect
+import gzip
+import json
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+
+from model_metrics import percentile
+from output_files import STATS as OUTPUT_STATS, write_text
+
+INDEX_VERSION = 1
+
+# Document kinds, stored as the first field of each document
+KINDS = ('lead', 'contributor', 'skill')
+
+# Kana, CJK ideographs and Hangul; punctuation is not indexed
+IDEOGRAPHS = r'\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af'
+TOKEN = re.compile(rf'[a-z0-9]+[+#]*|[{IDEOGRAPHS}]+')
+
+DEFAULT_LIMIT = 20
+
+LOADER_SCRIPT = r'''/* Client-side search over search/<lang>.json, built by scripts/search_index.py */
+(function (root) {
+    var TOKEN = /[a-z0-9]+[+#]*|[IDEOGRAPHS]+/g;
+    var IDEOGRAPH = /^[IDEOGRAPHS]/;
+
+    function tokenize(text) {
+        var tokens = [], match;
+        text = text.normalize('NFKC').toLowerCase();
+        TOKEN.lastIndex = 0;
+        while ((match = TOKEN.exec(text))) {
+            var word = match[0];
+            if (!IDEOGRAPH.test(word) || word.length < 2) {
+                tokens.push(word);
+            } else {
+                for (var i = 0; i < word.length - 1; i++) tokens.push(word.substr(i, 2));
+            }
+        }
+        return tokens;
+    }
+
+    function Index(data) {
+        this.docs = data.docs;
+        this.terms = data.terms;
+        this.postings = data.postings.map(function (deltas) {
+            var ids = new Int32Array(deltas.length), id = 0;
+            for (var i = 0; i < deltas.length; i++) ids[i] = (id += deltas[i]);
+            return ids;
+        });
+        // stamp[id] is the search step a document last matched
+        this.stamp = new Int32Array(this.docs.length);
+        this.generation = 0;
+    }
+
+    // First term >= prefix
+    Index.prototype.lowerBound = function (prefix) {
+        var lo = 0, hi = this.terms.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (this.terms[mid] < prefix) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    };
+
+    // Documents matching every query token as a prefix, in index order
+    Index.prototype.search = function (query, limit) {
+        var tokens = tokenize(query), stamp = this.stamp;
+        var results = [];
+        if (!tokens.length) return results;
+        for (var t = 0; t < tokens.length; t++) {
+            var token = tokens[t], mark = ++this.generation;
+            for (var i = this.lowerBound(token); i < this.terms.length &&
+                    this.terms[i].lastIndexOf(token, 0) === 0; i++) {
+                var ids = this.postings[i];
+                for (var j = 0; j < ids.length; j++) {
+                    var previous = stamp[ids[j]];
+                    // Keep only documents that also matched the previous token
+                    if (t === 0 || previous === mark - 1) stamp[ids[j]] = mark;
+                }
+            }
+        }
+        limit = limit || 20;
+        for (var d = 0; d < this.docs.length && results.length < limit; d++) {
+            if (stamp[d] === this.generation) results.push(this.docs[d]);
+        }
+        return results;
+    };
+
+    var SiteSearch = {
+        tokenize: tokenize,
+        Index: Index,
+        load: function (url) {
+            return fetch(url).then(function (r) { return r.json(); }).then(function (data) {
+                return new Index(data);
+            });
+        }
+    };
+    if (typeof module !== 'undefined' && module.exports) module.exports = SiteSearch;
+    else root.SiteSearch = SiteSearch;
+})(this);
+'''.replace('IDEOGRAPHS', IDEOGRAPHS)
+
+
+def tokenize(text):
+    """Split text into search terms; CJK runs become overlapping bigrams"""
+    tokens = []
+    for word in TOKEN.findall(unicodedata.normalize('NFKC', text).lower()):
+        if word[0].isascii() or len(word) < 2:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def collect_documents(data):
+    """
+    Return (documents, texts): documents are [kind, title, link] entries
+    shipped to the browser, texts the searchable text for each.
+    For skills the link field holds the category name.
+    """
+    documents, texts = [], []
+    projects = data['projects']
+    for kind, key in (('lead', 'leadProjects'), ('contributor', 'contributorProjects')):
+        for project in projects[key]:
+            documents.append([KINDS.index(kind), project['name'],
+                              project.get('github') or project.get('website') or ''])
+            texts.append(' '.join(project.get(field, '') for field in ('name', 'badge', 'description')))
+    for category in data['skills']['categories']:
+        for item in category['items']:
+            documents.append([KINDS.index('skill'), item, category['name']])
+            texts.append(f"{item} {category['name']}")
+    return documents, texts
+
+
+def build_index(data):
+    """Build the index for one locale's data"""
+    documents, texts = collect_documents(data)
+    postings = {}
+    for doc_id, text in enumerate(texts):
+        for term in set(tokenize(text)):
+            postings.setdefault(term, []).append(doc_id)
+
+    terms = sorted(postings)
+    encoded = []
+    for term in terms:
+        previous = 0
+        deltas = []
+        for doc_id in postings[term]:
+            deltas.append(doc_id - previous)
+            previous = doc_id
+        encoded.append(deltas)
+    return {'v': INDEX_VERSION, 'docs': documents, 'terms': terms, 'postings': encoded}
+
+
+def dump_index(index):
+    return json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+
+
+class SearchIndex:
+    """Python counterpart of the browser loader, used for --query and checks"""
+
+    def __init__(self, index):
+        self.docs = index['docs']
+        self.terms = index['terms']
+        self.postings = []
+        for deltas in index['postings']:
+            ids, doc_id = [], 0
+            for delta in deltas:
+                doc_id += delta
+                ids.append(doc_id)
+            self.postings.append(ids)
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        matches = None
+        for token in tokenize(query):
+            found = set()
+            i = bisect.bisect_left(self.terms, token)
+            while i < len(self.terms) and self.terms[i].startswith(token):
+                found.update(self.postings[i])
+                i += 1
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return [self.docs[d] for d in sorted(matches or ())[:limit]]
+
+
+def write_indexes(data_dir, output_dir):
+    """Write search/<lang>.json for each locale and the loader script"""
+    for lang_code in ('zh', 'en'):
+        with open(data_dir / f'{lang_code}.json', 'r', encoding='utf-8') as f:
+            index = build_index(json.load(f))
+        text = dump_index(index)
+        write_text(output_dir / f'{lang_code}.json', text)
+        print(f"✓ Generated {output_dir / f'{lang_code}.json'}: {len(index['docs'])} documents, "
+              f"{len(index['terms'])} terms, {len(text.encode('utf-8'))} bytes")
+    write_text(output_dir / 'search.js', LOADER_SCRIPT)
+    print(f"✓ Generated {output_dir / 'search.js'}")
+    OUTPUT_STATS.report()
+
+
+def synthetic_data(items, seed=0):
+    """Locale data with about `items` projects and skills of mixed zh/en text"""
+    rng = random.Random(seed)
+    latin = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9)))
+             for _ in range(4000)]
+    hanzi = [chr(rng.randint(0x4e00, 0x4fff)) for _ in range(600)]
+
+    def sentence():
+        words = [rng.choice(latin) if rng.random() < 0.5
+                 else ''.join(rng.choice(hanzi) for _ in range(rng.randint(2, 4)))
+                 for _ in range(rng.randint(6, 14))]
+        return ' '.join(words)
+
+    projects = [{'name': f'{rng.choice(latin).title()}{i}', 'badge': rng.choice(hanzi) * 2,
+                 'description': sentence(), 'github': f'https://github.com/example/p{i}'}
+                for i in range(items * 9 // 10)]
+    half = len(projects) // 2
+    categories = [{'name': sentence()[:12], 'items': [rng.choice(latin) for _ in range(10)]}
+                  for _ in range((items - len(projects)) // 10)]
+    return {'projects': {'leadProjects': projects[:half], 'contributorProjects': projects[half:]},
+            'skills': {'categories': categories}}, latin, hanzi
+
+
+NODE_BENCH = r'''
+const SiteSearch = require(process.argv[2]);
+const fs = require('fs');
+const data = JSON.parse(fs.readFileSync(process.argv[3], 'utf8'));
+const queries = JSON.parse(fs.readFileSync(process.argv[4], 'utf8'));
+let start = process.hrtime.bigint();
+const index = new SiteSearch.Index(data);
+const loadMs = Number(process.hrtime.bigint() - start) / 1e6;
+for (const q of queries.slice(0, 200)) index.search(q);  // warm up
+const times = [];
+let results = 0;
+for (const q of queries) {
+    start = process.hrtime.bigint();
+    results += index.search(q).length;
+    times.push(Number(process.hrtime.bigint() - start) / 1e6);
+}
+console.log(JSON.stringify({loadMs, times, results}));
+'''
+
+
+def run_benchmark(items, query_count):
+    """Measure index size and query latency for a synthetic data set"""
+    data, latin, hanzi = synthetic_data(items)
+    start = time.perf_counter()
+    index = build_index(data)
+    build_ms = (time.perf_counter() - start) * 1000
+    text = dump_index(index).encode('utf-8')
+
+    rng = random.Random(1)
+    queries = []
+    for _ in range(query_count):
+        kind = rng.random()
+        if kind < 0.4:
+            queries.append(rng.choice(latin)[:rng.randint(1, 5)])
+        elif kind < 0.7:
+            queries.append(''.join(rng.choice(hanzi) for _ in range(rng.randint(1, 3))))
+        else:
+            queries.append(f"{rng.choice(latin)} {rng.choice(latin)[:3]}")
+
+    print(f"Documents: {len(index['docs'])}")
+    print(f"Terms: {len(index['terms'])}")
+    print(f"Build: {build_ms:.0f} ms")
+    print(f"Index size: {len(text)} bytes ({len(gzip.compress(text))} gzip)")
+
+    search_index = SearchIndex(index)
+    times = []
+    for query in queries:
+        start = time.perf_counter()
+        search_index.search(query)
+        times.append((time.perf_counter() - start) * 1000)
+    print(f"\n{'Loader':<10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print(f"{'python':<10}" + ''.join(f"{v:>10.3f}" for v in (
+        percentile(times, 50), percentile(times, 90), percentile(times, 99), max(times))))
+
+    node = shutil.which('node')
+    if not node:
+        print("(node not found, skipping search.js benchmark)")
+        return 0
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / 'search.js').write_text(LOADER_SCRIPT, encoding='utf-8')
+        (tmp / 'index.json').write_bytes(text)
+        (tmp / 'queries.json').write_text(json.dumps(queries, ensure_ascii=False), encoding='utf-8')
+        (tmp / 'bench.js').write_text(NODE_BENCH, encoding='utf-8')
+        result = subprocess.run([node, str(tmp / 'bench.js'), str(tmp / 'search.js'),
+                                 str(tmp / 'index.json'), str(tmp / 'queries.json')],
+                                capture_output=True, text=True, check=True)
+    measured = json.loads(result.stdout)
+    times = measured['times']
+    print(f"{'search.js':<10}" + ''.join(f"{v:>10.3f}" for v in (
+        percentile(times, 50), percentile(times, 90), percentile(times, 99), max(times))))
+    print(f"\nsearch.js index load: {measured['loadMs']:.1f} ms")
+    return 0
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Build the client-side search index')
+    parser.add_argument('--data', type=Path, default=Path('data'), help='Data directory (default: data)')
+    parser.add_argument('--output', type=Path, default=Path('search'), help='Output directory (default: search)')
+    parser.add_argument('--query', help='Search the index built from --data instead of writing it')
+    parser.add_argument('--lang', default='zh', choices=('zh', 'en'), help='Locale for --query')
+    parser.add_argument('--bench', action='store_true', help='Benchmark with synthetic data')
+    parser.add_argument('--items', type=int, default=10000, help='Items for --bench (default: 10000)')
+    parser.add_argument('--queries', type=int, default=2000, help='Queries for --bench (default: 2000)')
+    args = parser.parse_args()
+
+    if args.bench:
+        return run_benchmark(args.items, args.queries)
+
+    try:
+        if args.query is not None:
+            with open(args.data / f'{args.lang}.json', 'r', encoding='utf-8') as f:
+                search_index = SearchIndex(build_index(json.load(f)))
+            for kind, title, link in search_index.search(args.query):
+                print(f"{KINDS[kind]:<12}{title:<30}{link}")
+            return 0
+        write_indexes(args.data, args.output)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Serve the generated site locally the way production serves it.
+Files are loaded into memory at startup (large files and their .br/.gz
+siblings are sent from disk with sendfile), every response carries a
+strong ETag derived from the content hash, conditional GETs are answered
+with 304, and precompressed br/gzip variants are negotiated from
+Accept-Encoding.
+
+Usage:
+    python scripts/serve.py [root] [--port 8000]
+    python scripts/serve.py [root] --bench [--requests 5000] [--concurrency 8]
+"""
+
+import argparse
+import gzip
+import hashlib
+import http.client
+import mimetypes
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from model_metrics import percentile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Files larger than this are not kept in memory but sent with sendfile
+MAX_IN_MEMORY_BYTES = 8 * 1024 * 1024
+
+# Content types worth compressing
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript',
+                      'application/xml', 'image/svg+xml')
+
+# Encodings in order of preference when the client accepts several equally
+ENCODING_PREFERENCE = ('br', 'gzip')
+PRECOMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+class Variant:
+    """One encoding of a file: either bytes in memory or a path on disk"""
+
+    __slots__ = ('body', 'path', 'size', 'etag')
+
+    def __init__(self, etag, body=None, path=None, size=None):
+        self.etag = etag
+        self.body = body
+        self.path = path
+        self.size = len(body) if body is not None else size
+
+
+class StaticFile:
+    """A servable file with its identity and compressed variants"""
+
+    __slots__ = ('content_type', 'variants')
+
+    def __init__(self, content_type, variants):
+        self.content_type = content_type
+        self.variants = variants
+
+
+def file_digest(path):
+    """Return the sha256 hex digest of a file without reading it at once"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_file(path, compress=True):
+    """Load a file and prepare its identity, br and gzip variants"""
+    content_type = mimetypes.guess_type(path.name)[0] or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/json', 'application/javascript'):
+        content_type += '; charset=utf-8'
+
+    compressible = compress and content_type.startswith(COMPRESSIBLE_TYPES)
+    size = path.stat().st_size
+    if size > MAX_IN_MEMORY_BYTES:
+        digest = file_digest(path)[:32]
+        variants = {'identity': Variant(f'"{digest}"', path=path, size=size)}
+        if compressible:
+            # Only variants already on disk, sent with sendfile like the
+            # original; compressing here would mean reading it all in
+            for encoding in ENCODING_PREFERENCE:
+                precompressed = path.with_name(path.name + PRECOMPRESSED_SUFFIXES[encoding])
+                if precompressed.exists() and precompressed.stat().st_size < size:
+                    variants[encoding] = Variant(f'"{digest}-{encoding}"', path=precompressed,
+                                                 size=precompressed.stat().st_size)
+        return StaticFile(content_type, variants)
+
+    body = path.read_bytes()
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    variants = {'identity': Variant(f'"{digest}"', body=body)}
+
+    if compressible:
+        for encoding in ENCODING_PREFERENCE:
+            precompressed = path.with_name(path.name + PRECOMPRESSED_SUFFIXES[encoding])
+            if precompressed.exists():
+                encoded = precompressed.read_bytes()
+            elif encoding == 'gzip':
+                encoded = gzip.compress(body, compresslevel=9, mtime=0)
+            elif encoding == 'br' and brotli is not None:
+                encoded = brotli.compress(body, quality=11)
+            else:
+                continue
+            if len(encoded) < len(body):
+                variants[encoding] = Variant(f'"{digest}-{encoding}"', body=encoded)
+
+    return StaticFile(content_type, variants)
+
+
+def load_site(root, compress=True):
+    """Map URL paths to StaticFile objects for every non-hidden file under root"""
+    files = {}
+    precompressed_suffixes = tuple(PRECOMPRESSED_SUFFIXES.values())
+    for path in sorted(root.rglob('*')):
+        relative = path.relative_to(root)
+        if not path.is_file() or any(part.startswith('.') for part in relative.parts):
+            continue
+        if path.name.endswith(precompressed_suffixes) and path.with_suffix('').exists():
+            continue
+        files['/' + relative.as_posix()] = load_file(path, compress)
+    return files
+
+
+def parse_accept_encoding(header):
+    """Return {encoding: q} from an Accept-Encoding header"""
+    accepted = {}
+    for part in (header or '').split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    return accepted
+
+
+def choose_variant(static_file, accept_encoding):
+    """Pick the best encoding the client accepts; returns (encoding, Variant)"""
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get('*', 0.0)
+    best = ('identity', static_file.variants['identity'])
+    best_q = 0.0
+    for encoding in ENCODING_PREFERENCE:
+        variant = static_file.variants.get(encoding)
+        q = accepted.get(encoding, wildcard)
+        if variant is not None and q > best_q:
+            best, best_q = (encoding, variant), q
+    return best
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+def make_handler(files):
+    """Create a request handler bound to the loaded files"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        server_version = 'gmij-serve'
+
+        def setup(self):
+            super().setup()
+            # Headers and body are written separately; without TCP_NODELAY
+            # Nagle's algorithm stalls every keep-alive response
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def resolve(self):
+            path = unquote(urlsplit(self.path).path)
+            if path.endswith('/'):
+                path += 'index.html'
+            for candidate in (path, path + '.html', path + '/index.html'):
+                if candidate in files:
+                    return files[candidate]
+            return None
+
+        def do_GET(self):
+            self.respond(send_body=True)
+
+        def do_HEAD(self):
+            self.respond(send_body=False)
+
+        def respond(self, send_body):
+            static_file = self.resolve()
+            if static_file is None:
+                body = b'404 Not Found\n'
+                self.send_response(404)
+                self.send_header('Content-Type', 'text/plain; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if send_body:
+                    self.wfile.write(body)
+                return
+
+            encoding, variant = choose_variant(static_file, self.headers.get('Accept-Encoding'))
+            if_none_match = self.headers.get('If-None-Match')
+            if if_none_match and etag_matches(if_none_match, variant.etag):
+                self.send_response(304)
+                self.send_header('ETag', variant.etag)
+                self.send_header('Vary', 'Accept-Encoding')
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header('Content-Type', static_file.content_type)
+            self.send_header('Content-Length', str(variant.size))
+            self.send_header('ETag', variant.etag)
+            self.send_header('Cache-Control', 'no-cache')
+            if len(static_file.variants) > 1:
+                self.send_header('Vary', 'Accept-Encoding')
+            if encoding != 'identity':
+                self.send_header('Content-Encoding', encoding)
+            self.end_headers()
+            if not send_body:
+                return
+            if variant.body is not None:
+                self.wfile.write(variant.body)
+            else:
+                self.wfile.flush()
+                with open(variant.path, 'rb') as f:
+                    self.connection.sendfile(f)
+
+        def log_message(self, format, *args):
+            if not getattr(self.server, 'quiet', False):
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def create_server(root, host='127.0.0.1', port=8000, compress=True):
+    """Load the site and create (but don't start) the HTTP server"""
+    files = load_site(root, compress)
+    server = ThreadingHTTPServer((host, port), make_handler(files))
+    server.daemon_threads = True
+    return server, files
+
+
+def run_load_test(host, port, path, total_requests, concurrency, conditional):
+    """Hammer the server with keep-alive connections and report throughput"""
+    per_worker = max(1, total_requests // concurrency)
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+
+    etag = None
+    if conditional:
+        conn = http.client.HTTPConnection(host, port)
+        conn.request('GET', path, headers={'Accept-Encoding': 'br, gzip'})
+        response = conn.getresponse()
+        response.read()
+        etag = response.getheader('ETag')
+        conn.close()
+
+    def worker():
+        headers = {'Accept-Encoding': 'br, gzip'}
+        if etag:
+            headers['If-None-Match'] = etag
+        conn = http.client.HTTPConnection(host, port)
+        local_latencies = []
+        local_statuses = {}
+        for _ in range(per_worker):
+            start = time.perf_counter()
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            local_latencies.append((time.perf_counter() - start) * 1000)
+            local_statuses[response.status] = local_statuses.get(response.status, 0) + 1
+        conn.close()
+        with lock:
+            latencies.extend(local_latencies)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print(f"Requests:    {len(latencies)} to {path} ({concurrency} connections"
+          f"{', conditional' if etag else ''})")
+    print(f"Statuses:    {', '.join(f'{s}×{n}' for s, n in sorted(statuses.items()))}")
+    print(f"Throughput:  {len(latencies) / elapsed:.0f} req/s")
+    print(f"Latency:     p50 {percentile(latencies, 50):.2f} ms  p90 {percentile(latencies, 90):.2f} ms  "
+          f"p99 {percentile(latencies, 99):.2f} ms  max {max(latencies):.2f} ms")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Serve the generated site locally')
+    parser.add_argument('root', nargs='?', type=Path, default=Path('.'), help='Site root (default: .)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--no-compress', action='store_true', help='Serve identity encoding only')
+    parser.add_argument('--bench', action='store_true', help='Run a load test against an in-process server')
+    parser.add_argument('--path', default='/', help='Path requested by the load test')
+    parser.add_argument('--requests', type=int, default=5000, help='Total load-test requests')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent load-test connections')
+    parser.add_argument('--conditional', action='store_true', help='Load test with If-None-Match')
+    args = parser.parse_args()
+
+    if args.bench:
+        args.port = 0
+    server, files = create_server(args.root, args.host, args.port, compress=not args.no_compress)
+    host, port = server.server_address[:2]
+    encoded = sum(1 for f in files.values() if len(f.variants) > 1)
+    print(f"✓ Loaded {len(files)} files from {args.root} ({encoded} with br/gzip variants)")
+
+    if args.bench:
+        server.quiet = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            run_load_test(host, port, args.path, args.requests, args.concurrency, args.conditional)
+        finally:
+            server.shutdown()
+            server.server_close()
+        return 0
+
+    print(f"Serving on http://{host}:{port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
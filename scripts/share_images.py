@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Render share images (og:image / twitter:image) for each page.
+The image shows header.name, header.tagline and header.stats in the site's
+colours. Images are rendered in a worker pool and cached in
+.cache/share-images under a hash of the fields drawn, the layout version,
+the fonts and the Pillow version, so an unchanged header is never
+rendered twice. generate-html.py and generate-sites.py add the meta tags
+for any image found next to the pages.
+
+Pillow is optional: without it this stage fails and pages are built
+without image tags. A CJK font (for example fonts-noto-cjk) is needed for
+the Chinese image; set SHARE_IMAGE_FONT / SHARE_IMAGE_BOLD_FONT to use
+specific font files.
+
+Usage:
+    python scripts/share_images.py [--format png|webp] [--workers N]
+    python scripts/share_images.py --sites sites --output public
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from data_model import ContentError, load_content
+from model_metrics import percentile
+from output_files import STATS as OUTPUT_STATS, write_bytes
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    from PIL import __version__ as PILLOW_VERSION
+except ImportError:
+    Image = None
+    PILLOW_VERSION = None
+
+# Bump whenever the drawing code changes, to invalidate cached images
+LAYOUT_VERSION = 1
+
+WIDTH, HEIGHT = 1200, 630
+MARGIN = 80
+
+CACHE_DIR = Path('.cache/share-images')
+IMAGE_DIR = 'images'
+FORMATS = ('png', 'webp')
+LOCALES = ('zh', 'en')
+
+# Colours from the stylesheet in generate-html.py
+COLORS = {
+    'bg_primary': (15, 20, 25),
+    'bg_secondary': (26, 31, 41),
+    'text_primary': (230, 237, 243),
+    'text_secondary': (139, 148, 158),
+    'accent': (59, 158, 255),
+    'border': (48, 54, 61),
+}
+
+# Tried in order; CJK-capable fonts first so the Chinese image has glyphs
+FONT_CANDIDATES = {
+    'regular': [
+        '/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc',
+        '/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc',
+        '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
+        '/System/Library/Fonts/PingFang.ttc',
+        'C:/Windows/Fonts/msyh.ttc',
+        '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf',
+    ],
+    'bold': [
+        '/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc',
+        '/usr/share/fonts/noto-cjk/NotoSansCJK-Bold.ttc',
+        '/usr/share/fonts/truetype/wqy/wqy-microhei.ttc',
+        '/System/Library/Fonts/PingFang.ttc',
+        'C:/Windows/Fonts/msyhbd.ttc',
+        '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    ],
+}
+FONT_ENV = {'regular': 'SHARE_IMAGE_FONT', 'bold': 'SHARE_IMAGE_BOLD_FONT'}
+
+
+def image_path(lang_code, fmt):
+    """Share image path relative to the site root"""
+    return f'{IMAGE_DIR}/share-{lang_code}.{fmt}'
+
+
+def existing_image(site_root, lang_code):
+    """The share image rendered for a locale under site_root, or None"""
+    for fmt in FORMATS:
+        if (Path(site_root) / image_path(lang_code, fmt)).exists():
+            return image_path(lang_code, fmt)
+    return None
+
+
+def find_fonts():
+    """Font files to draw with, {'regular': path, 'bold': path}"""
+    fonts = {}
+    for weight, candidates in FONT_CANDIDATES.items():
+        override = os.environ.get(FONT_ENV[weight])
+        for path in ([override] if override else []) + candidates:
+            if Path(path).exists():
+                fonts[weight] = path
+                break
+        else:
+            fonts[weight] = None
+    return fonts
+
+
+def image_fields(header):
+    """The header fields drawn on the image"""
+    return {
+        'name': header.name,
+        'tagline': header.tagline,
+        'stats': [[stat.number, stat.label] for stat in header.stats],
+    }
+
+
+def cache_key(fields, fmt, fonts):
+    payload = json.dumps({'layout': LAYOUT_VERSION, 'fields': fields, 'format': fmt,
+                          'fonts': fonts, 'pillow': PILLOW_VERSION},
+                         ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def load_font(path, size):
+    if path:
+        return ImageFont.truetype(path, size)
+    return ImageFont.load_default(size)
+
+
+def fit_font(draw, text, path, size, max_width, min_size):
+    """The largest font up to size that fits text on one line"""
+    while size > min_size:
+        font = load_font(path, size)
+        if draw.textlength(text, font=font) <= max_width:
+            return font
+        size -= 4
+    return load_font(path, min_size)
+
+
+def wrap_text(draw, text, font, max_width, max_lines):
+    """Wrap on spaces, or between characters for CJK text"""
+    joiner = ' ' if ' ' in text else ''
+    lines = ['']
+    for word in (text.split(' ') if joiner else text):
+        candidate = f'{lines[-1]}{joiner}{word}' if lines[-1] else word
+        if not lines[-1] or draw.textlength(candidate, font=font) <= max_width:
+            lines[-1] = candidate
+        elif len(lines) == max_lines:
+            lines[-1] += '…'
+            break
+        else:
+            lines.append(word)
+    return lines
+
+
+def render_image(fields, fmt, fonts):
+    """Draw the share image and return the encoded bytes"""
+    image = Image.new('RGB', (WIDTH, HEIGHT), COLORS['bg_primary'])
+    draw = ImageDraw.Draw(image)
+
+    # Vertical gradient like the page header, and an accent bar
+    top, bottom = COLORS['bg_secondary'], COLORS['bg_primary']
+    for y in range(HEIGHT):
+        t = y / (HEIGHT - 1)
+        draw.line([(0, y), (WIDTH, y)], fill=tuple(round(a + (b - a) * t) for a, b in zip(top, bottom)))
+    draw.rectangle([0, 0, 12, HEIGHT], fill=COLORS['accent'])
+
+    content_width = WIDTH - 2 * MARGIN
+    name_font = fit_font(draw, fields['name'], fonts['bold'], 96, content_width, 48)
+    draw.text((MARGIN, MARGIN), fields['name'], font=name_font, fill=COLORS['text_primary'])
+
+    y = MARGIN + name_font.size + 36
+    tagline_font = load_font(fonts['regular'], 40)
+    for line in wrap_text(draw, fields['tagline'], tagline_font, content_width, 2):
+        draw.text((MARGIN, y), line, font=tagline_font, fill=COLORS['text_secondary'])
+        y += 56
+
+    stats = fields['stats'][:4]
+    if stats:
+        stats_top = HEIGHT - MARGIN - 150
+        draw.line([(MARGIN, stats_top - 28), (WIDTH - MARGIN, stats_top - 28)], fill=COLORS['border'], width=2)
+        column = content_width / len(stats)
+        label_font = load_font(fonts['regular'], 26)
+        for i, (number, label) in enumerate(stats):
+            x = MARGIN + i * column
+            number_font = fit_font(draw, number, fonts['bold'], 56, column - 32, 32)
+            draw.text((x, stats_top), number, font=number_font, fill=COLORS['accent'])
+            for j, line in enumerate(wrap_text(draw, label, label_font, column - 32, 2)):
+                draw.text((x, stats_top + 76 + j * 34), line, font=label_font, fill=COLORS['text_secondary'])
+
+    buffer = io.BytesIO()
+    if fmt == 'webp':
+        image.save(buffer, 'WEBP', quality=85, method=6)
+    else:
+        # A 256-colour palette is plenty for flat colours and text
+        image.quantize(colors=256).save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def timed_render(args):
+    """Worker entry point: (key, image bytes, render ms)"""
+    key, fields, fmt, fonts = args
+    start = time.perf_counter()
+    data = render_image(fields, fmt, fonts)
+    return key, data, (time.perf_counter() - start) * 1000
+
+
+def build_images(pages, fmt='png', workers=None, cache_dir=CACHE_DIR):
+    """
+    Render a share image for each (header, output_path) in pages.
+    Returns {'rendered', 'cached', 'render_ms': [...]} for the report.
+    """
+    fonts = find_fonts()
+    jobs = {}
+    for header, output_path in pages:
+        fields = image_fields(header)
+        key = cache_key(fields, fmt, fonts)
+        jobs.setdefault(key, (fields, []))[1].append(Path(output_path))
+
+    results = {}
+    misses = []
+    for key, (fields, _) in jobs.items():
+        cached = Path(cache_dir) / f'{key}.{fmt}'
+        if cached.exists():
+            results[key] = cached.read_bytes()
+        else:
+            misses.append((key, fields, fmt, fonts))
+
+    render_ms = []
+    if misses:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for key, data, ms in pool.map(timed_render, misses):
+                write_bytes(Path(cache_dir) / f'{key}.{fmt}', data, stats=None)
+                results[key] = data
+                render_ms.append(ms)
+
+    for key, (_, outputs) in jobs.items():
+        for output_path in outputs:
+            write_bytes(output_path, results[key])
+            # Drop an image left over from the other format, so pages
+            # don't keep pointing at it
+            for other in FORMATS:
+                stale = output_path.with_suffix(f'.{other}')
+                if other != fmt and stale.exists():
+                    stale.unlink()
+    return {'rendered': len(misses), 'cached': len(jobs) - len(misses), 'render_ms': render_ms}
+
+
+def collect_pages(sites_dir, output_dir, fmt):
+    """(header, output_path) for every locale of the site or of each batch site"""
+    if sites_dir is None:
+        return [(load_content(Path('data') / f'{lang}.json').header, Path(image_path(lang, fmt)))
+                for lang in LOCALES]
+    pages = []
+    for site_json in sorted(Path(sites_dir).glob('*/site.json')):
+        site_dir = site_json.parent
+        for lang in LOCALES:
+            pages.append((load_content(site_dir / f'{lang}.json').header,
+                          Path(output_dir) / site_dir.name / image_path(lang, fmt)))
+    return pages
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Render og:image / twitter:image share images')
+    parser.add_argument('--format', choices=FORMATS, default='png', help='Image format (default: png)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='Worker processes (default: CPU count)')
+    parser.add_argument('--sites', type=Path, help='Render for every site in this directory (generate-sites.py)')
+    parser.add_argument('--output', type=Path, default=Path('public'),
+                        help='Output directory for --sites (default: public)')
+    args = parser.parse_args()
+
+    if Image is None:
+        print("Error: Pillow is required for share images (pip install Pillow)")
+        return 1
+    fonts = find_fonts()
+    if not fonts['regular'] or 'dejavu' in fonts['regular'].lower():
+        print("⚠ No CJK font found; Chinese text may not render (install fonts-noto-cjk or set SHARE_IMAGE_FONT)")
+
+    try:
+        pages = collect_pages(args.sites, args.output, args.format)
+    except (OSError, ContentError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    start = time.perf_counter()
+    result = build_images(pages, args.format, args.workers)
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    total = result['rendered'] + result['cached']
+    hit_rate = result['cached'] / total if total else 0
+    print(f"✓ {len(pages)} share images ({total} distinct): {result['rendered']} rendered, "
+          f"{result['cached']} from cache ({hit_rate:.0%} hit rate) in {wall_ms:.0f} ms")
+    if result['render_ms']:
+        times = result['render_ms']
+        print(f"  Render time per image: p50 {percentile(times, 50):.0f} ms, "
+              f"max {max(times):.0f} ms, total {sum(times):.0f} ms")
+    OUTPUT_STATS.report()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
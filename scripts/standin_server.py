@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub Models chat completions endpoint.
+It answers with the current data/en.json and data/zh.json (or a marked-up
+echo for translation requests) and sleeps for a time proportional to the
+prompt and completion size, so prompt changes can be benchmarked without
+calling the real API. Both the labeled free-text mode and the
+response_format json_schema mode are supported. failure_rate injects the
+same failures into either mode, including follow-up repair requests: half
+are cut off mid-response, half are well-formed but miss a field.
+
+Usage:
+    python scripts/standin_server.py [--port 8765]
+    MODELS_API_URL=http://127.0.0.1:8765/ python scripts/generate-json.py
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from prompt_builder import estimate_tokens
+from schema_validation import get_path, parse_pointer
+
+
+class StandInModelServer:
+    """Threaded stand-in server, usable as a context manager"""
+
+    def __init__(self, port=0, data_dir=Path('data'), base_ms=50.0,
+                 ms_per_prompt_token=0.05, ms_per_completion_token=2.0,
+                 failure_rate=0.0, seed=None):
+        self.data_dir = Path(data_dir)
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.base_ms = base_ms
+        self.ms_per_prompt_token = ms_per_prompt_token
+        self.ms_per_completion_token = ms_per_completion_token
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def load_locale(self, locale):
+        return json.loads((self.data_dir / f'{locale}.json').read_text(encoding='utf-8'))
+
+    def pick_failure(self):
+        """None, 'truncate' or 'missing_field' for the next response"""
+        if not self.failure_rate or self.random.random() >= self.failure_rate:
+            return None
+        return self.random.choice(('truncate', 'missing_field'))
+
+    def drop_field(self, documents):
+        """Delete one string field (or repaired value) from the documents"""
+        candidates = []
+
+        def collect(node, parent=None, key=None):
+            if isinstance(node, dict):
+                for k, v in node.items():
+                    collect(v, node, k)
+            elif isinstance(node, list):
+                for v in node:
+                    collect(v)
+            elif parent is not None:
+                candidates.append((parent, key))
+
+        collect(documents)
+        if candidates:
+            parent, key = self.random.choice(candidates)
+            del parent[key]
+
+    def truncate(self, content):
+        """Cut the response off somewhere after its first character"""
+        return content[:self.random.randint(1, max(1, len(content) - 2))]
+
+    def structured_content(self, json_schema, failure):
+        """Answer a response_format json_schema request"""
+        properties = json_schema['schema'].get('properties', {})
+        if json_schema.get('name', '').endswith('_repair'):
+            documents = {locale: self.load_locale(locale) for locale in ('en', 'zh')}
+            answer = {ptr: get_path(documents, parse_pointer(ptr)) for ptr in properties}
+        else:
+            answer = {locale: self.load_locale(locale) for locale in properties}
+        if failure == 'missing_field':
+            self.drop_field(answer)
+        content = json.dumps(answer, ensure_ascii=False)
+        return self.truncate(content) if failure == 'truncate' else content
+
+    def completion_content(self, payload):
+        """Return the assistant message for a request payload"""
+        failure = self.pick_failure()
+        response_format = payload.get('response_format') or {}
+        if response_format.get('type') == 'json_schema':
+            return self.structured_content(response_format['json_schema'], failure)
+
+        prompt = payload.get('messages', [{}])[-1].get('content', '')
+        if prompt.startswith('Translate each Chinese string'):
+            strings = json.loads(prompt[prompt.index('\n['):])
+            return json.dumps([f"[en] {s}" for s in strings], ensure_ascii=False)
+
+        documents = {locale: self.load_locale(locale) for locale in ('en', 'zh')
+                     if f'"{locale.upper()}_JSON:"' in prompt}
+        if failure == 'missing_field':
+            self.drop_field(documents)
+        content = '\n\n'.join(f"{locale.upper()}_JSON:\n```json\n"
+                               f"{json.dumps(document, indent=2, ensure_ascii=False)}\n```"
+                               for locale, document in documents.items())
+        return self.truncate(content) if failure == 'truncate' else content
+
+    def respond(self, payload):
+        """Build the completion response and the simulated processing delay"""
+        prompt = ''.join(m.get('content', '') for m in payload.get('messages', []))
+        content = self.completion_content(payload)
+        prompt_tokens = estimate_tokens(prompt)
+        completion_tokens = estimate_tokens(content)
+        delay_ms = (self.base_ms + prompt_tokens * self.ms_per_prompt_token
+                    + completion_tokens * self.ms_per_completion_token)
+        body = {
+            'model': payload.get('model', 'stand-in'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}}],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': completion_tokens,
+                'total_tokens': prompt_tokens + completion_tokens,
+            },
+        }
+        return 200, body, delay_ms
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                try:
+                    payload = json.loads(self.rfile.read(length) or b'{}')
+                except json.JSONDecodeError:
+                    payload = {}
+                server.requests += 1
+                status, body, delay_ms = server.respond(payload)
+                time.sleep(delay_ms / 1000)
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Run a local stand-in for GitHub Models')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Fraction of responses that are malformed or incomplete')
+    args = parser.parse_args()
+
+    server = StandInModelServer(port=args.port, failure_rate=args.failure_rate)
+    print(f"Stand-in GitHub Models server listening on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Incremental loading of content files for generate-html.py --stream.
+The file is read in chunks and walked key by key; the about items, project
+lists and skill categories are decoded one element at a time and handed to
+a callback as model objects (see data_model.py), so each card can be
+rendered and its parsed form dropped while the rest of the file is still
+being read. Everything else is small and is loaded as usual.
+
+Usage:
+    python scripts/stream_content.py bench [--mb 100]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from data_model import ITEM_LOADERS, ContentError, from_data, synthetic_content
+from schema_validation import pointer
+
+# Arrays delivered element by element instead of being kept in the model
+STREAMED_ARRAYS = (
+    ('about', 'items'),
+    ('projects', 'leadProjects'),
+    ('projects', 'contributorProjects'),
+    ('skills', 'categories'),
+)
+
+CHUNK_SIZE = 1 << 20
+
+WHITESPACE = ' \t\n\r'
+
+DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """A JSON text read in chunks, decoded one value at a time"""
+
+    def __init__(self, f, chunk_size=CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """Read at least as much again as is buffered, so retries stay linear"""
+        chunk = self.f.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Skip whitespace and return the next character ('' at the end)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self.fill():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ContentError(f"expected {' or '.join(map(repr, chars))} but found {char or 'end of file'!r}")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete value"""
+        self.peek()
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.buf, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buf) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+
+def _read_array(reader, path, on_item):
+    load = ITEM_LOADERS[path]
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.pos += 1
+        return
+    index = 0
+    while True:
+        item = reader.value()
+        try:
+            on_item(path, load(item))
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ContentError(f"{pointer(path + (index,))}: invalid item ({e!r})") from None
+        index += 1
+        if reader.expect(',]') == ']':
+            return
+
+
+def _read_object(reader, path, on_item):
+    obj = {}
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.pos += 1
+        return obj
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ContentError(f"{pointer(path)}: expected a property name")
+        reader.expect(':')
+        child = path + (key,)
+        if child in STREAMED_ARRAYS and reader.peek() == '[':
+            _read_array(reader, child, on_item)
+            obj[key] = []
+        elif any(p[:len(child)] == child for p in STREAMED_ARRAYS) and reader.peek() == '{':
+            obj[key] = _read_object(reader, child, on_item)
+        else:
+            obj[key] = reader.value()
+        if reader.expect(',}') == '}':
+            return obj
+
+
+def stream_content(path, on_item, chunk_size=CHUNK_SIZE):
+    """
+    Read a content file, calling on_item(array_path, item) for each element
+    of STREAMED_ARRAYS in file order. Returns the model with those arrays
+    left empty.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = _Reader(f, chunk_size)
+        try:
+            data = _read_object(reader, (), on_item)
+            if reader.peek():
+                raise ContentError("unexpected data after the top-level object")
+        except ContentError as e:
+            raise ContentError(f"{path}: {e}") from None
+        except json.JSONDecodeError as e:
+            # Positions in e are relative to the buffer, not the file
+            raise ContentError(f"{path}: {e.msg}") from None
+    try:
+        return from_data(data)
+    except ContentError as e:
+        raise ContentError(f"{path}: {e}") from None
+
+
+def write_synthetic_data(data_dir, target_mb):
+    """Write zh.json and en.json of at least target_mb each"""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    source = Path(__file__).resolve().parent.parent / 'data'
+    for lang_code in ('zh', 'en'):
+        sample = len(json.dumps(synthetic_content(source / f'{lang_code}.json', 1000),
+                                indent=2, ensure_ascii=False).encode('utf-8'))
+        projects = int(target_mb * 1e6 / sample * 1000) + 1
+        with open(data_dir / f'{lang_code}.json', 'w', encoding='utf-8') as f:
+            json.dump(synthetic_content(source / f'{lang_code}.json', projects), f,
+                      indent=2, ensure_ascii=False)
+
+
+def run_generate_html(workdir, stream):
+    """
+    Run generate-html.py in workdir.
+    Returns (seconds, peak RSS in MB, exit code or negative signal number).
+    """
+    command = [sys.executable, str(Path(__file__).resolve().parent / 'generate-html.py')]
+    if stream:
+        command.append('--stream')
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, cwd=workdir, stdout=subprocess.DEVNULL)
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux
+    return elapsed, usage.ru_maxrss / 1024, os.waitstatus_to_exitcode(status)
+
+
+def run_benchmark(target_mb):
+    """Compare peak RSS and time of the loading and streaming paths"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_synthetic_data(tmp / 'load' / 'data', target_mb)
+        shutil.copytree(tmp / 'load' / 'data', tmp / 'stream' / 'data')
+        sizes = [(tmp / 'load' / 'data' / f'{l}.json').stat().st_size / 1e6 for l in ('zh', 'en')]
+        print(f"Input: zh.json {sizes[0]:.0f} MB, en.json {sizes[1]:.0f} MB")
+
+        print(f"\n{'Path':<12}{'time s':>10}{'peak RSS MB':>14}")
+        codes = {}
+        for name, stream in (('load', False), ('stream', True)):
+            elapsed, rss, codes[name] = run_generate_html(tmp / name, stream)
+            status = '' if codes[name] == 0 else (f"  killed by signal {-codes[name]}" if codes[name] < 0
+                                                  else f"  failed with exit code {codes[name]}")
+            print(f"{name:<12}{elapsed:>10.1f}{rss:>14.0f}{status}")
+
+        if codes['stream'] != 0:
+            print("\nError: the streaming path failed")
+            return 1
+        if codes['load'] != 0:
+            print("\n(no output to compare from the loading path; rerun with a smaller --mb "
+                  "to check byte-identity)")
+            return 0
+        identical = all(
+            (tmp / 'load' / page).read_bytes() == (tmp / 'stream' / page).read_bytes()
+            for page in ('index.html', 'index-en.html')
+        )
+    print(f"\n{'✓' if identical else 'Error:'} output {'byte-identical' if identical else 'differs'}")
+    return 0 if identical else 1
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Streaming content ingestion')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    bench = subparsers.add_parser('bench', help='Measure peak RSS of generate-html.py with and without --stream')
+    bench.add_argument('--mb', type=float, default=100, help='Size of each generated data file (default: 100)')
+    args = parser.parse_args()
+    return run_benchmark(args.mb)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Local translation memory for zh → en content.
+Accepted translations are stored in a SQLite file keyed by a hash of the
+source string. generate-json.py pre-fills every known string from it and
+only sends unseen strings to the model, in a single batched request.
+
+The memory is seeded from the committed data/zh.json and data/en.json, so
+it picks up manual edits to en.json. Only a pair that lines up is used:
+data/translation-source.json is committed with en.json and records a hash
+of the zh.json it was translated from, so a zh.json committed without its
+en.json (a run that failed halfway) is not paired with the older en.json,
+even when the SQLite file is not in the cache.
+
+Usage:
+    python scripts/translation_memory.py stats
+"""
+
+import argparse
+import hashlib
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+from output_files import write_json
+from prompt_builder import CJK, estimate_tokens
+
+DEFAULT_DB_PATH = Path('.cache/translation-memory.sqlite')
+
+# Tracked next to data/en.json: which data/zh.json it was translated from
+ALIGNMENT_PATH = Path('data/translation-source.json')
+
+# Fields whose English value is not a translation of the Chinese one
+LOCALE_OVERRIDES = {
+    ('ui', 'langButton'): '中文',
+}
+
+
+def source_hash(text):
+    """Stable key for a source string"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def needs_translation(text):
+    """
+    Return True if the string contains Chinese text. Anything else (URLs,
+    names, numbers, icons) is copied to en.json unchanged.
+    """
+    return bool(CJK.search(text))
+
+
+def iter_strings(data, path=()):
+    """Yield (path, value) for every string leaf in a JSON document"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from iter_strings(value, path + (key,))
+    elif isinstance(data, list):
+        for index, value in enumerate(data):
+            yield from iter_strings(value, path + (index,))
+    elif isinstance(data, str):
+        yield path, data
+
+
+def map_strings(data, func, path=()):
+    """Return a copy of data with every string leaf replaced by func(path, value)"""
+    if isinstance(data, dict):
+        return {key: map_strings(value, func, path + (key,)) for key, value in data.items()}
+    if isinstance(data, list):
+        return [map_strings(value, func, path + (index,)) for index, value in enumerate(data)]
+    if isinstance(data, str):
+        return func(path, data)
+    return data
+
+
+def _lookup(data, path):
+    for key in path:
+        if isinstance(data, dict) and key in data:
+            data = data[key]
+        elif isinstance(data, list) and isinstance(key, int) and key < len(data):
+            data = data[key]
+        else:
+            return None
+    return data if isinstance(data, str) else None
+
+
+def is_aligned(source_text, path=ALIGNMENT_PATH):
+    """Whether the committed en.json was translated from source_text"""
+    try:
+        recorded = json.loads(Path(path).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return False
+    return recorded.get('sha256') == source_hash(source_text)
+
+
+def mark_aligned(source_text, path=ALIGNMENT_PATH):
+    """
+    Record the zh.json text the committed en.json was translated from, or
+    None when en.json no longer matches any committed zh.json
+    """
+    write_json(path, {
+        'source': 'data/zh.json',
+        'sha256': source_hash(source_text) if source_text is not None else None,
+    })
+
+
+class TranslationMemory:
+    """SQLite-backed map from source-string hashes to accepted translations"""
+
+    def __init__(self, path=DEFAULT_DB_PATH, source_lang='zh', target_lang='en'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.source_lang = source_lang
+        self.target_lang = target_lang
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS translations (
+                source_hash TEXT NOT NULL,
+                source_lang TEXT NOT NULL,
+                target_lang TEXT NOT NULL,
+                source TEXT NOT NULL,
+                target TEXT NOT NULL,
+                updated_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (source_hash, source_lang, target_lang)
+            )''')
+        self.hits = 0
+        self.misses = 0
+        self.saved_tokens = 0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get_many(self, sources):
+        """Return {source: translation} for the sources already in memory"""
+        found = {}
+        by_hash = {source_hash(s): s for s in sources}
+        hashes = list(by_hash)
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            rows = self.conn.execute(
+                f'''SELECT source_hash, target FROM translations
+                    WHERE source_lang = ? AND target_lang = ?
+                    AND source_hash IN ({','.join('?' * len(chunk))})''',
+                [self.source_lang, self.target_lang, *chunk])
+            for digest, target in rows:
+                found[by_hash[digest]] = target
+        return found
+
+    def put_many(self, pairs):
+        """Store (source, translation) pairs as accepted translations"""
+        with self.conn:
+            self.conn.executemany(
+                '''INSERT INTO translations (source_hash, source_lang, target_lang, source, target)
+                   VALUES (?, ?, ?, ?, ?)
+                   ON CONFLICT (source_hash, source_lang, target_lang)
+                   DO UPDATE SET target = excluded.target, updated_at = CURRENT_TIMESTAMP''',
+                [(source_hash(s), self.source_lang, self.target_lang, s, t) for s, t in pairs])
+
+    def seed(self, source_data, target_data):
+        """Record the aligned string pairs of two documents with the same shape"""
+        pairs = []
+        for path, source in iter_strings(source_data):
+            if path in LOCALE_OVERRIDES or not needs_translation(source):
+                continue
+            target = _lookup(target_data, path)
+            if target and not needs_translation(target):
+                pairs.append((source, target))
+        self.put_many(pairs)
+        return len(pairs)
+
+    def translate(self, source_data, translate_batch):
+        """
+        Build the target document from source_data.
+        Known strings come from memory; the rest are passed to
+        translate_batch(list_of_strings) -> list_of_translations in one call.
+        """
+        pending = sorted({s for path, s in iter_strings(source_data)
+                          if path not in LOCALE_OVERRIDES and needs_translation(s)})
+        known = self.get_many(pending)
+        unseen = [s for s in pending if s not in known]
+
+        self.hits += len(known)
+        self.misses += len(unseen)
+        # A hit saves the source in the prompt and the translation in the completion
+        self.saved_tokens += sum(estimate_tokens(s) + estimate_tokens(t) for s, t in known.items())
+
+        if unseen:
+            translated = translate_batch(unseen)
+            if len(translated) != len(unseen):
+                raise ValueError(f"Expected {len(unseen)} translations, got {len(translated)}")
+            new_pairs = list(zip(unseen, translated))
+            self.put_many(new_pairs)
+            known.update(new_pairs)
+
+        def translate_leaf(path, value):
+            if path in LOCALE_OVERRIDES:
+                return LOCALE_OVERRIDES[path]
+            return known.get(value, value)
+
+        return map_strings(source_data, translate_leaf)
+
+    def report(self):
+        """Print hit-rate and saved-token stats for this run"""
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 1.0
+        print(f"✓ Translation memory: {self.hits}/{total} strings reused ({rate:.0%} hit rate), "
+              f"{self.misses} sent to the model, ~{self.saved_tokens} tokens saved")
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Inspect the local translation memory')
+    parser.add_argument('command', choices=['stats'])
+    parser.add_argument('--db', type=Path, default=DEFAULT_DB_PATH)
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"No translation memory at {args.db}")
+        return 0
+    with TranslationMemory(args.db) as memory:
+        print(f"{args.db}: {memory.count()} translations")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+/* Client-side search over search/<lang>.json, built by scripts/search_index.py */
+(function (root) {
+    var TOKEN = /[a-z0-9]+[+#]*|[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]+/g;
+    var IDEOGRAPH = /^[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]/;
+
+    function tokenize(text) {
+        var tokens = [], match;
+        text = text.normalize('NFKC').toLowerCase();
+        TOKEN.lastIndex = 0;
+        while ((match = TOKEN.exec(text))) {
+            var word = match[0];
+            if (!IDEOGRAPH.test(word) || word.length < 2) {
+                tokens.push(word);
+            } else {
+                for (var i = 0; i < word.length - 1; i++) tokens.push(word.substr(i, 2));
+            }
+        }
+        return tokens;
+    }
+
+    function Index(data) {
+        this.docs = data.docs;
+        this.terms = data.terms;
+        this.postings = data.postings.map(function (deltas) {
+            var ids = new Int32Array(deltas.length), id = 0;
+            for (var i = 0; i < deltas.length; i++) ids[i] = (id += deltas[i]);
+            return ids;
+        });
+        // stamp[id] is the search step a document last matched
+        this.stamp = new Int32Array(this.docs.length);
+        this.generation = 0;
+    }
+
+    // First term >= prefix
+    Index.prototype.lowerBound = function (prefix) {
+        var lo = 0, hi = this.terms.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (this.terms[mid] < prefix) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    };
+
+    // Documents matching every query token as a prefix, in index order
+    Index.prototype.search = function (query, limit) {
+        var tokens = tokenize(query), stamp = this.stamp;
+        var results = [];
+        if (!tokens.length) return results;
+        for (var t = 0; t < tokens.length; t++) {
+            var token = tokens[t], mark = ++this.generation;
+            for (var i = this.lowerBound(token); i < this.terms.length &&
+                    this.terms[i].lastIndexOf(token, 0) === 0; i++) {
+                var ids = this.postings[i];
+                for (var j = 0; j < ids.length; j++) {
+                    var previous = stamp[ids[j]];
+                    // Keep only documents that also matched the previous token
+                    if (t === 0 || previous === mark - 1) stamp[ids[j]] = mark;
+                }
+            }
+        }
+        limit = limit || 20;
+        for (var d = 0; d < this.docs.length && results.length < limit; d++) {
+            if (stamp[d] === this.generation) results.push(this.docs[d]);
+        }
+        return results;
+    };
+
+    var SiteSearch = {
+        tokenize: tokenize,
+        Index: Index,
+        load: function (url) {
+            return fetch(url).then(function (r) { return r.json(); }).then(function (data) {
+                return new Index(data);
+            });
+        }
+    };
+    if (typeof module !== 'undefined' && module.exports) module.exports = SiteSearch;
+    else root.SiteSearch = SiteSearch;
+})(this);